@@ -0,0 +1,51 @@
+"""Line-level provenance on sources
+
+Revision ID: 002_source_provenance
+Revises: 001_initial_schema
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '002_source_provenance'
+down_revision: Union[str, None] = '001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A source can back a person, a parent-child edge or a marriage
+    op.add_column('sources', sa.Column('parent_child_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('sources', sa.Column('marriage_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('sources_parent_child_id_fkey', 'sources', 'parent_child',
+                          ['parent_child_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('sources_marriage_id_fkey', 'sources', 'marriages',
+                          ['marriage_id'], ['id'], ondelete='CASCADE')
+    op.create_index('idx_sources_parent_child_id', 'sources', ['parent_child_id'])
+    op.create_index('idx_sources_marriage_id', 'sources', ['marriage_id'])
+
+    # Location of the OCR lines: 1-based line numbers and byte range in the page file
+    op.add_column('sources', sa.Column('page', sa.Integer(), nullable=True))
+    op.add_column('sources', sa.Column('line_start', sa.Integer(), nullable=True))
+    op.add_column('sources', sa.Column('line_end', sa.Integer(), nullable=True))
+    op.add_column('sources', sa.Column('byte_offset', sa.Integer(), nullable=True))
+    op.add_column('sources', sa.Column('byte_end', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'byte_end')
+    op.drop_column('sources', 'byte_offset')
+    op.drop_column('sources', 'line_end')
+    op.drop_column('sources', 'line_start')
+    op.drop_column('sources', 'page')
+    op.drop_index('idx_sources_marriage_id', table_name='sources')
+    op.drop_index('idx_sources_parent_child_id', table_name='sources')
+    op.drop_constraint('sources_marriage_id_fkey', 'sources', type_='foreignkey')
+    op.drop_constraint('sources_parent_child_id_fkey', 'sources', type_='foreignkey')
+    op.drop_column('sources', 'marriage_id')
+    op.drop_column('sources', 'parent_child_id')
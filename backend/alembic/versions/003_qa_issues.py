@@ -0,0 +1,39 @@
+"""Stored QA issues
+
+Revision ID: 003_qa_issues
+Revises: 002_source_provenance
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003_qa_issues'
+down_revision: Union[str, None] = '002_source_provenance'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Current results of the SQL QA checks, one row per issue
+    op.create_table(
+        'qa_issues',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('person_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('issue_type', sa.String(50), nullable=False),
+        sa.Column('severity', sa.String(10), nullable=False),
+        sa.Column('detail', sa.Text(), nullable=True),
+        sa.Column('detected_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['person_id'], ['persons.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_qa_issues_person_id', 'qa_issues', ['person_id'])
+    op.create_index('idx_qa_issues_severity_type', 'qa_issues', ['severity', 'issue_type'])
+
+
+def downgrade() -> None:
+    op.drop_table('qa_issues')
@@ -0,0 +1,115 @@
+import time
+from collections import Counter
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import require_admin
+from app.db.session import get_db
+from app.services.qa_service import QAService
+from app.schemas.genealogy import QAIssue, QAReport, ComponentSummary
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+SEVERITIES = ["HIGH", "MEDIUM", "LOW"]
+
+
+@router.get("/qa", response_model=QAReport)
+async def run_qa_checks(
+    severity: str | None = Query(None, pattern="^(HIGH|MEDIUM|LOW)$", description="Only this severity"),
+    issue_type: str | None = Query(None, alias="type", description="Only this issue type"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Run the data quality checks against the live database."""
+    started = time.perf_counter()
+    results = await QAService(db).run_checks()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    issues = [issue for check_issues in results.values() for issue in check_issues]
+    if severity:
+        issues = [i for i in issues if i["severity"] == severity]
+    if issue_type:
+        issues = [i for i in issues if i["type"] == issue_type]
+    issues.sort(key=lambda i: (SEVERITIES.index(i["severity"]), i["type"], i["name"]))
+
+    return QAReport(
+        checks={title: len(check_issues) for title, check_issues in results.items()},
+        byType=dict(Counter(i["type"] for i in issues)),
+        issues=[
+            QAIssue(
+                type=i["type"],
+                severity=i["severity"],
+                personId=i["person_id"],
+                name=i["name"],
+                birthYear=i["birth_year"],
+                detail=i["detail"]
+            )
+            for i in issues
+        ],
+        totalCount=len(issues),
+        elapsedMs=round(elapsed_ms, 1)
+    )
+
+
+@router.get("/qa/issues", response_model=QAReport)
+async def list_qa_issues(
+    severity: str | None = Query(None, pattern="^(HIGH|MEDIUM|LOW)$", description="Only this severity"),
+    issue_type: str | None = Query(None, alias="type", description="Only this issue type"),
+    limit: int = Query(100, ge=0, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Current stored QA issues (kept up to date after each edit), most severe first."""
+    started = time.perf_counter()
+    issues, total, by_type = await QAService(db).list_issues(severity, issue_type, limit, offset)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return QAReport(
+        byType=by_type,
+        issues=[
+            QAIssue(
+                type=i.issue_type,
+                severity=i.severity,
+                personId=i.person_id,
+                name=i.person.display_name,
+                birthYear=i.person.birth_year,
+                detail=i.detail or "",
+                detectedAt=i.detected_at
+            )
+            for i in issues
+        ],
+        totalCount=total,
+        elapsedMs=round(elapsed_ms, 1)
+    )
+
+
+@router.post("/qa/refresh", response_model=QAReport)
+async def refresh_qa_issues(db: AsyncSession = Depends(get_db)):
+    """Re-run all checks and replace the stored QA issues."""
+    started = time.perf_counter()
+    service = QAService(db)
+    stored = await service.rebuild_issues()
+    _, _, by_type = await service.list_issues(limit=0)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return QAReport(byType=by_type, totalCount=stored, elapsedMs=round(elapsed_ms, 1))
+
+
+@router.get("/qa/components", response_model=ComponentSummary)
+async def get_components(
+    limit: int = Query(50, ge=1, le=10000, description="Largest component sizes to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Connected family groups over parent-child and marriage links, largest first."""
+    started = time.perf_counter()
+    summary = await QAService(db).get_components()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return ComponentSummary(
+        persons=summary["persons"],
+        components=summary["components"],
+        mainComponent=summary["main_component"],
+        islands=summary["islands"],
+        singletons=summary["singletons"],
+        sizes=summary["sizes"][:limit],
+        elapsedMs=round(elapsed_ms, 1)
+    )
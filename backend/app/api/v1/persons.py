@@ -5,9 +5,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.services.person_service import PersonService
+from app.services.source_service import SourceService
+from app.services.qa_service import QAService
+from app.services.merge_service import MergeService
+from app.services.page_text_store import PageTextStore, get_page_text_store
+from app.api.v1.sources import source_to_record
 from app.schemas.genealogy import (
     PersonDetail, PersonSummary, SearchResponse, SearchResult,
-    AliasSchema, SpouseInfo, PersonCreate, PersonUpdate
+    AliasSchema, SpouseInfo, PersonCreate, PersonUpdate, SourceRecord,
+    PersonMerge, PersonMergeResult
 )
 
 router = APIRouter()
@@ -153,6 +159,7 @@ async def create_person(
     """Create a new person."""
     service = PersonService(db)
     person = await service.create(data)
+    await QAService(db).refresh_issues([person.id])
 
     # Fetch full details for response
     return await get_person(person.id, db)
@@ -171,6 +178,8 @@ async def update_person(
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
 
+    await QAService(db).refresh_issues([person.id])
+
     # Fetch full details for response
     return await get_person(person.id, db)
 
@@ -182,11 +191,64 @@ async def delete_person(
 ):
     """Delete a person and all related records."""
     service = PersonService(db)
+    qa = QAService(db)
+    # Relatives lose a relationship, so re-check them once the person is gone
+    neighborhood = await qa.get_neighborhood([person_id])
     deleted = await service.delete(person_id)
 
     if not deleted:
         raise HTTPException(status_code=404, detail="Person not found")
 
+    await qa.refresh_issues([pid for pid in neighborhood if pid != person_id], expand=False)
+
+
+@router.post("/{person_id}/merge", response_model=PersonMergeResult)
+async def merge_persons(
+    person_id: UUID,
+    data: PersonMerge,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Merge duplicate records into this person: relationships, aliases and
+    sources move over, missing fields are filled from the duplicates, and
+    the duplicates are deleted.
+    """
+    person = await PersonService(db).get_by_id(person_id)
+
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+
+    try:
+        counts = await MergeService(db).merge(person_id, data.duplicate_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return PersonMergeResult(
+        person=await get_person(person_id, db),
+        merged=list(dict.fromkeys(data.duplicate_ids)),
+        counts=counts
+    )
+
+
+@router.get("/{person_id}/sources", response_model=List[SourceRecord])
+async def get_person_sources(
+    person_id: UUID,
+    context: int = Query(0, ge=0, le=20, description="Lines of surrounding text"),
+    db: AsyncSession = Depends(get_db),
+    store: PageTextStore = Depends(get_page_text_store)
+):
+    """
+    Get the sources of a person and their relationships, with the OCR
+    lines each was parsed from.
+    """
+    person = await PersonService(db).get_by_id(person_id)
+
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+
+    sources = await SourceService(db).get_for_person(person_id)
+    return [source_to_record(s, store, context) for s in sources]
+
 
 @router.post("/{person_id}/aliases", response_model=AliasSchema, status_code=status.HTTP_201_CREATED)
 async def add_alias(
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.services.relationship_service import RelationshipService
+from app.services.qa_service import QAService
 from app.schemas.genealogy import MarriageCreate, ParentChildCreate
 
 router = APIRouter()
@@ -45,6 +46,7 @@ async def create_marriage(
     service = RelationshipService(db)
     try:
         marriage = await service.create_marriage(data)
+        await QAService(db).refresh_issues([marriage.spouse1_id, marriage.spouse2_id])
         return MarriageResponse(
             id=marriage.id,
             spouse1Id=marriage.spouse1_id,
@@ -64,11 +66,14 @@ async def delete_marriage(
 ):
     """Delete a marriage by ID."""
     service = RelationshipService(db)
-    deleted = await service.delete_marriage(marriage_id)
-
-    if not deleted:
+    marriage = await service.get_marriage_by_id(marriage_id)
+    if not marriage:
         raise HTTPException(status_code=404, detail="Marriage not found")
 
+    spouses = [marriage.spouse1_id, marriage.spouse2_id]
+    await service.delete_marriage(marriage_id)
+    await QAService(db).refresh_issues(spouses)
+
 
 @router.delete("/marriages/by-spouses/{spouse1_id}/{spouse2_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_marriage_by_spouses(
@@ -83,6 +88,8 @@ async def delete_marriage_by_spouses(
     if not deleted:
         raise HTTPException(status_code=404, detail="Marriage not found")
 
+    await QAService(db).refresh_issues([spouse1_id, spouse2_id])
+
 
 # Parent-child endpoints
 @router.post("/parent-child", response_model=ParentChildResponse, status_code=status.HTTP_201_CREATED)
@@ -94,6 +101,7 @@ async def create_parent_child(
     service = RelationshipService(db)
     try:
         relationship = await service.create_parent_child(data)
+        await QAService(db).refresh_issues([relationship.parent_id, relationship.child_id])
         return ParentChildResponse(
             id=relationship.id,
             parentId=relationship.parent_id,
@@ -111,11 +119,14 @@ async def delete_parent_child(
 ):
     """Delete a parent-child relationship by ID."""
     service = RelationshipService(db)
-    deleted = await service.delete_parent_child(relationship_id)
-
-    if not deleted:
+    relationship = await service.get_parent_child_by_id(relationship_id)
+    if not relationship:
         raise HTTPException(status_code=404, detail="Relationship not found")
 
+    persons = [relationship.parent_id, relationship.child_id]
+    await service.delete_parent_child(relationship_id)
+    await QAService(db).refresh_issues(persons)
+
 
 @router.delete("/parent-child/by-persons/{parent_id}/{child_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_parent_child_by_persons(
@@ -129,3 +140,5 @@ async def delete_parent_child_by_persons(
 
     if not deleted:
         raise HTTPException(status_code=404, detail="Relationship not found")
+
+    await QAService(db).refresh_issues([parent_id, child_id])
@@ -0,0 +1,80 @@
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.models import Source
+from app.services.source_service import SourceService
+from app.services.page_text_store import PageTextStore, get_page_text_store
+from app.schemas.genealogy import SourceRecord, SourceSnippet
+
+router = APIRouter()
+
+
+def source_snippet(source: Source, store: PageTextStore, context: int = 0) -> Optional[SourceSnippet]:
+    """Read the OCR text a source points at, if it has a location."""
+    if source.page is None or source.byte_offset is None or source.byte_end is None:
+        return None
+    snippet = store.snippet(source.page, source.byte_offset, source.byte_end, context)
+    if snippet is None:
+        return None
+    return SourceSnippet(
+        text=snippet['text'],
+        contextBefore=snippet['context_before'],
+        contextAfter=snippet['context_after']
+    )
+
+
+def source_to_record(source: Source, store: PageTextStore, context: int = 0) -> SourceRecord:
+    """Convert Source model to SourceRecord schema, with its OCR snippet."""
+    return SourceRecord(
+        id=source.id,
+        sourceType=source.source_type,
+        personId=source.person_id,
+        parentChildId=source.parent_child_id,
+        marriageId=source.marriage_id,
+        sourceText=source.source_text,
+        sourceDate=source.source_date,
+        page=source.page,
+        lineStart=source.line_start,
+        lineEnd=source.line_end,
+        byteOffset=source.byte_offset,
+        snippet=source_snippet(source, store, context)
+    )
+
+
+@router.get("/{source_id}", response_model=SourceRecord)
+async def get_source(
+    source_id: UUID,
+    context: int = Query(0, ge=0, le=20, description="Lines of surrounding text"),
+    db: AsyncSession = Depends(get_db),
+    store: PageTextStore = Depends(get_page_text_store)
+):
+    """Get a source with the OCR text it was parsed from."""
+    source = await SourceService(db).get_by_id(source_id)
+
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+
+    return source_to_record(source, store, context)
+
+
+@router.get("/{source_id}/snippet", response_model=SourceSnippet)
+async def get_source_snippet(
+    source_id: UUID,
+    context: int = Query(2, ge=0, le=20, description="Lines of surrounding text"),
+    db: AsyncSession = Depends(get_db),
+    store: PageTextStore = Depends(get_page_text_store)
+):
+    """Get only the OCR text of a source, with surrounding lines."""
+    source = await SourceService(db).get_by_id(source_id)
+
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+
+    snippet = source_snippet(source, store, context)
+    if snippet is None:
+        raise HTTPException(status_code=404, detail="No OCR text for this source")
+
+    return snippet
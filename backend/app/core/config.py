@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     domain: str = "localhost"
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
 
+    # OCR page files (page-NNN.txt) that source snippets are served from
+    ocr_output_dir: str = "../ocr_output"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
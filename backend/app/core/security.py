@@ -0,0 +1,11 @@
+import secrets
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+
+
+async def require_admin(x_admin_key: str | None = Header(None, alias="X-Admin-Key")) -> None:
+    """Dependency for admin-only endpoints: checks the X-Admin-Key header."""
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.admin_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
@@ -3,5 +3,6 @@ from app.models.alias import PersonAlias
 from app.models.marriage import Marriage
 from app.models.parent_child import ParentChild
 from app.models.source import Source
+from app.models.qa_issue import QualityIssue
 
-__all__ = ["Person", "PersonAlias", "Marriage", "ParentChild", "Source"]
+__all__ = ["Person", "PersonAlias", "Marriage", "ParentChild", "Source", "QualityIssue"]
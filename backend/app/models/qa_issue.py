@@ -0,0 +1,31 @@
+import uuid
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class QualityIssue(Base):
+    __tablename__ = "qa_issues"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    person_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("persons.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    issue_type = Column(String(50), nullable=False)  # qa_check.py vocabulary, e.g. 'PARENT_TOO_YOUNG'
+    severity = Column(String(10), nullable=False)  # 'HIGH', 'MEDIUM', 'LOW'
+    detail = Column(Text, nullable=True)
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    person = relationship("Person")
+
+    # Indexes
+    __table_args__ = (
+        Index("idx_qa_issues_severity_type", "severity", "issue_type"),
+    )
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,9 +17,27 @@ class Source(Base):
         nullable=True,
         index=True
     )
-    source_type = Column(String(100), nullable=True)  # 'probate', 'census', 'church_record', 'oral_history'
+    parent_child_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("parent_child.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True
+    )
+    marriage_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("marriages.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True
+    )
+    source_type = Column(String(100), nullable=True)  # 'probate', 'census', 'church_record', 'oral_history', 'ocr_page'
     source_text = Column(Text, nullable=True)
     source_date = Column(String(100), nullable=True)
+    # OCR provenance ('ocr_page' sources): page file, 1-based line range, byte range
+    page = Column(Integer, nullable=True)
+    line_start = Column(Integer, nullable=True)
+    line_end = Column(Integer, nullable=True)
+    byte_offset = Column(Integer, nullable=True)
+    byte_end = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -8,6 +8,13 @@ from app.schemas.genealogy import (
     TreeNode,
     PersonCreate,
     PersonUpdate,
+    PersonMerge,
+    PersonMergeResult,
+    SourceSnippet,
+    SourceRecord,
+    QAIssue,
+    ComponentSummary,
+    QAReport,
 )
 
 __all__ = [
@@ -20,4 +27,11 @@ __all__ = [
     "TreeNode",
     "PersonCreate",
     "PersonUpdate",
+    "PersonMerge",
+    "PersonMergeResult",
+    "SourceSnippet",
+    "SourceRecord",
+    "QAIssue",
+    "ComponentSummary",
+    "QAReport",
 ]
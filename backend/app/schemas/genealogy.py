@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -90,6 +90,71 @@ class TreeNode(BaseModel):
         populate_by_name = True
 
 
+class SourceSnippet(BaseModel):
+    text: str
+    context_before: str = Field("", alias="contextBefore")
+    context_after: str = Field("", alias="contextAfter")
+
+    class Config:
+        populate_by_name = True
+
+
+class SourceRecord(BaseModel):
+    id: UUID
+    source_type: Optional[str] = Field(None, alias="sourceType")
+    person_id: Optional[UUID] = Field(None, alias="personId")
+    parent_child_id: Optional[UUID] = Field(None, alias="parentChildId")
+    marriage_id: Optional[UUID] = Field(None, alias="marriageId")
+    source_text: Optional[str] = Field(None, alias="sourceText")
+    source_date: Optional[str] = Field(None, alias="sourceDate")
+    page: Optional[int] = None
+    line_start: Optional[int] = Field(None, alias="lineStart")
+    line_end: Optional[int] = Field(None, alias="lineEnd")
+    byte_offset: Optional[int] = Field(None, alias="byteOffset")
+    snippet: Optional[SourceSnippet] = None
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
+
+class QAIssue(BaseModel):
+    type: str
+    severity: str
+    person_id: UUID = Field(alias="personId")
+    name: str
+    birth_year: Optional[int] = Field(None, alias="birthYear")
+    detail: str
+    detected_at: Optional[datetime] = Field(None, alias="detectedAt")
+
+    class Config:
+        populate_by_name = True
+
+
+class ComponentSummary(BaseModel):
+    persons: int
+    components: int
+    main_component: int = Field(alias="mainComponent")
+    islands: int
+    singletons: int
+    sizes: List[int] = []
+    elapsed_ms: float = Field(alias="elapsedMs", default=0)
+
+    class Config:
+        populate_by_name = True
+
+
+class QAReport(BaseModel):
+    checks: Dict[str, int] = {}
+    by_type: Dict[str, int] = Field(alias="byType", default_factory=dict)
+    issues: List[QAIssue] = []
+    total_count: int = Field(alias="totalCount", default=0)
+    elapsed_ms: float = Field(alias="elapsedMs", default=0)
+
+    class Config:
+        populate_by_name = True
+
+
 # Request schemas for create/update
 class PersonCreate(BaseModel):
     display_name: str = Field(alias="displayName")
@@ -122,6 +187,22 @@ class PersonUpdate(BaseModel):
         populate_by_name = True
 
 
+class PersonMerge(BaseModel):
+    duplicate_ids: List[UUID] = Field(alias="duplicateIds", min_length=1)
+
+    class Config:
+        populate_by_name = True
+
+
+class PersonMergeResult(BaseModel):
+    person: PersonDetail
+    merged: List[UUID] = []
+    counts: Dict[str, int] = {}
+
+    class Config:
+        populate_by_name = True
+
+
 class MarriageCreate(BaseModel):
     spouse1_id: UUID = Field(alias="spouse1Id")
     spouse2_id: UUID = Field(alias="spouse2Id")
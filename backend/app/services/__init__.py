@@ -1,6 +1,25 @@
-"""Services for genealogy database."""
+"""
+Services for genealogy database.
 
-from app.services.person_service import PersonService
-from app.services.family_service import FamilyService
+Services are imported on first use, so the scripts can import the plain-SQL
+modules of this package (qa_sql, merge_sql, graph_integrity) without loading
+SQLAlchemy, the models and the settings.
+"""
 
-__all__ = ["PersonService", "FamilyService"]
+from importlib import import_module
+
+_SERVICE_MODULES = {
+    "PersonService": "person_service",
+    "FamilyService": "family_service",
+    "SourceService": "source_service",
+    "QAService": "qa_service",
+    "MergeService": "merge_service",
+}
+
+__all__ = list(_SERVICE_MODULES)
+
+
+def __getattr__(name: str):
+    if name in _SERVICE_MODULES:
+        return getattr(import_module(f"app.services.{_SERVICE_MODULES[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,251 @@
+"""
+Graph integrity checks over the whole family graph.
+
+Persons are numbered 0..n-1 and edges are kept in compact arrays (CSR
+adjacency for parent -> child, flat endpoint arrays for union-find), so
+both checks are linear in persons + edges and never recurse:
+
+- Ancestry cycles: Kahn's algorithm peels off every person that is not on
+  or below a cycle, then an iterative Tarjan pass over what is left finds
+  the strongly connected components, i.e. the cycle members.
+- Components: union-find over parent-child and marriage edges. The largest
+  component is the main clan; everything else is an island.
+  connected_components() is also used to cluster duplicate matches.
+"""
+
+from array import array
+from typing import Iterable, NamedTuple
+
+
+class Component(NamedTuple):
+    size: int
+    members: list  # person indexes
+
+
+class FamilyGraph:
+    """Parent-child and marriage edges over person indexes."""
+
+    def __init__(self, person_ids: list, parent_child: Iterable[tuple], marriages: Iterable[tuple]):
+        self.person_ids = person_ids
+        self.index = {pid: i for i, pid in enumerate(person_ids)}
+        n = len(person_ids)
+
+        # Flat endpoint arrays; edges to unknown persons are ignored
+        self.parents = array('l')
+        self.children = array('l')
+        for parent_id, child_id in parent_child:
+            p, c = self.index.get(parent_id), self.index.get(child_id)
+            if p is not None and c is not None:
+                self.parents.append(p)
+                self.children.append(c)
+
+        self.spouses1 = array('l')
+        self.spouses2 = array('l')
+        for spouse1_id, spouse2_id in marriages:
+            a, b = self.index.get(spouse1_id), self.index.get(spouse2_id)
+            if a is not None and b is not None:
+                self.spouses1.append(a)
+                self.spouses2.append(b)
+
+        # CSR adjacency parent -> children: the children of i are
+        # child_targets[child_offsets[i]:child_offsets[i + 1]]
+        offsets = array('l', bytes(8 * (n + 1)))
+        for p in self.parents:
+            offsets[p + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        targets = array('l', bytes(8 * len(self.parents)))
+        fill = array('l', offsets[:n])
+        for p, c in zip(self.parents, self.children):
+            targets[fill[p]] = c
+            fill[p] += 1
+        self.child_offsets = offsets
+        self.child_targets = targets
+
+    def __len__(self) -> int:
+        return len(self.person_ids)
+
+    def find_cycles(self) -> list:
+        """
+        Groups of persons that are their own ancestors (strongly connected
+        components of the parent -> child graph with more than one member,
+        or a self-parent). Each group is a list of person indexes.
+        """
+        n = len(self)
+        offsets, targets = self.child_offsets, self.child_targets
+
+        # Kahn: repeatedly remove persons with no remaining parents
+        indegree = array('l', bytes(8 * n))
+        for c in self.children:
+            indegree[c] += 1
+        stack = [i for i in range(n) if indegree[i] == 0]
+        removed = 0
+        while stack:
+            node = stack.pop()
+            removed += 1
+            for k in range(offsets[node], offsets[node + 1]):
+                child = targets[k]
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    stack.append(child)
+        if removed == n:
+            return []
+
+        # Iterative Tarjan over the persons Kahn could not remove
+        residual = [i for i in range(n) if indegree[i] > 0]
+        order = array('l', [-1]) * n
+        low = array('l', [0]) * n
+        on_stack = bytearray(n)
+        scc_stack = []
+        cycles = []
+        counter = 0
+
+        for root in residual:
+            if order[root] != -1:
+                continue
+            # Work stack of (node, next edge position)
+            work = [(root, offsets[root])]
+            order[root] = low[root] = counter
+            counter += 1
+            scc_stack.append(root)
+            on_stack[root] = 1
+
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    child = targets[edge]
+                    if indegree[child] == 0:
+                        continue  # Not on any cycle
+                    if order[child] == -1:
+                        order[child] = low[child] = counter
+                        counter += 1
+                        scc_stack.append(child)
+                        on_stack[child] = 1
+                        work.append((child, offsets[child]))
+                    elif on_stack[child]:
+                        low[node] = min(low[node], order[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    members = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack[member] = 0
+                        members.append(member)
+                        if member == node:
+                            break
+                    if len(members) > 1 or self._is_own_parent(node):
+                        cycles.append(members)
+
+        return cycles
+
+    def _is_own_parent(self, node: int) -> bool:
+        return node in self.child_targets[self.child_offsets[node]:self.child_offsets[node + 1]]
+
+    def components(self) -> list:
+        """Connected components over all edges, largest first."""
+        return connected_components(len(self), (self.parents, self.children), (self.spouses1, self.spouses2))
+
+
+def connected_components(n: int, *edge_lists: tuple) -> list:
+    """
+    Union-find over indexes 0..n-1. Each edge list is a pair of parallel
+    endpoint sequences (a, b). Returns Components, largest first.
+    """
+    root = array('l', range(n))
+    size = array('l', [1]) * n
+
+    def find(x: int) -> int:
+        while root[x] != x:
+            root[x] = root[root[x]]  # Path halving
+            x = root[x]
+        return x
+
+    for edges in edge_lists:
+        for a, b in zip(*edges):
+            ra, rb = find(a), find(b)
+            if ra == rb:
+                continue
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            root[rb] = ra
+            size[ra] += size[rb]
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(
+        (Component(len(members), members) for members in groups.values()),
+        key=lambda component: -component.size
+    )
+
+
+# Everything the graph checks need, as plain SQL for asyncpg and SQLAlchemy alike
+GRAPH_QUERIES = {
+    "persons": "SELECT id, display_name, birth_year FROM persons",
+    "parent_child": "SELECT parent_id, child_id FROM parent_child",
+    "marriages": "SELECT spouse1_id, spouse2_id FROM marriages",
+}
+
+
+def graph_issues(persons: list, parent_child: list, marriages: list) -> dict:
+    """
+    Run the cycle and component checks on rows from GRAPH_QUERIES.
+    Returns {check title: issues} in the same issue format as the SQL checks.
+    """
+    graph = FamilyGraph([row[0] for row in persons], parent_child, marriages)
+
+    def issue(i: int, issue_type: str, severity: str, detail: str) -> dict:
+        person_id, name, birth_year = persons[i][0], persons[i][1], persons[i][2]
+        return {
+            'type': issue_type,
+            'severity': severity,
+            'person_id': person_id,
+            'name': name,
+            'birth_year': birth_year,
+            'detail': detail,
+        }
+
+    cycle_issues = []
+    for members in graph.find_cycles():
+        names = ', '.join(persons[m][1] for m in members)
+        for m in members:
+            cycle_issues.append(issue(m, 'ANCESTRY_CYCLE', 'HIGH',
+                                      f"Is their own ancestor (cycle of {len(members)}: {names})"))
+
+    island_issues = []
+    components = graph.components()
+    if components:
+        main = components[0].size
+        # Single persons are already reported as NO_RELATIONSHIPS
+        for component in components[1:]:
+            if component.size < 2:
+                break
+            first = min(component.members, key=lambda m: (persons[m][2] is None, persons[m][2] or 0))
+            island_issues.append(issue(first, 'DISCONNECTED_COMPONENT', 'LOW',
+                                       f"Family group of {component.size} persons is not connected "
+                                       f"to the main clan ({main} persons)"))
+
+    return {
+        'Ancestry cycles': cycle_issues,
+        'Disconnected components': island_issues,
+    }
+
+
+def component_summary(persons: list, parent_child: list, marriages: list) -> dict:
+    """Component count and sizes (largest first) for rows from GRAPH_QUERIES."""
+    graph = FamilyGraph([row[0] for row in persons], parent_child, marriages)
+    sizes = [component.size for component in graph.components()]
+    return {
+        'persons': len(graph),
+        'components': len(sizes),
+        'main_component': sizes[0] if sizes else 0,
+        'islands': sum(1 for s in sizes[1:] if s > 1),
+        'singletons': sum(1 for s in sizes if s == 1),
+        'sizes': sizes,
+    }
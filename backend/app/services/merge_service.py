@@ -0,0 +1,69 @@
+"""
+Set-based person merging through the API's session. The merge statements
+themselves are in merge_sql.py, shared with scripts/deduplicate.py.
+"""
+
+from uuid import UUID
+from typing import Iterable
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PgUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.qa_service import QAService
+from app.services.merge_sql import MERGE_MAP_SQL, MERGE_MAP_FILL_SQL, MERGE_STATEMENTS
+
+
+class MergeService:
+    """Merges duplicate persons into one record through the session."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def merge(self, canonical_id: UUID, duplicate_ids: Iterable[UUID]) -> dict:
+        """
+        Merge the duplicates into the canonical person in one transaction and
+        re-check the canonical's neighborhood. Duplicates are ranked in the
+        order given when filling missing fields. Returns {label: rows affected}
+        for each merge statement.
+        """
+        duplicate_ids = list(dict.fromkeys(duplicate_ids))
+        if not duplicate_ids:
+            raise ValueError("No duplicates given")
+        if canonical_id in duplicate_ids:
+            raise ValueError("Cannot merge a person into themselves")
+
+        ids = bindparam("ids", type_=ARRAY(PgUUID(as_uuid=True)))
+        result = await self.session.execute(
+            text("SELECT id FROM persons WHERE id = ANY(:ids)").bindparams(ids),
+            {"ids": [canonical_id, *duplicate_ids]}
+        )
+        found = set(result.scalars().all())
+        if canonical_id not in found:
+            raise ValueError("Person not found")
+        missing = [str(pid) for pid in duplicate_ids if pid not in found]
+        if missing:
+            raise ValueError(f"Duplicates not found: {', '.join(missing)}")
+
+        try:
+            await self.session.execute(text(MERGE_MAP_SQL))
+            await self.session.execute(
+                text(MERGE_MAP_FILL_SQL).bindparams(
+                    bindparam("duplicate_ids", type_=ARRAY(PgUUID(as_uuid=True)))
+                ),
+                {"canonical_id": canonical_id, "duplicate_ids": duplicate_ids}
+            )
+            counts = {}
+            for label, sql in MERGE_STATEMENTS:
+                result = await self.session.execute(text(sql))
+                counts[label] = result.rowcount
+
+            # Commits the merge together with the re-checked issues
+            await QAService(self.session).refresh_issues([canonical_id])
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        # Rows were rewritten behind the ORM, so nothing loaded earlier is current
+        self.session.expire_all()
+        return counts
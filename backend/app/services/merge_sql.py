@@ -0,0 +1,209 @@
+"""
+Set-based person merging, as plain SQL.
+
+Merges are driven by a temp table mapping each duplicate to the record it
+is merged into:
+
+    merge_map(duplicate_id, canonical_id, rank)
+
+where rank orders the duplicates of one canonical (1 = best). Once the
+map is filled, MERGE_STATEMENTS rewrite every table with a fixed number of
+statements, however many persons are merged, so a whole merge runs in one
+transaction:
+
+- missing canonical fields are filled from the best-ranked duplicate that
+  has them, and duplicate notes are appended (the merge_person_data rules)
+- parent_child and marriages edges are moved onto the canonical; an edge
+  that would then repeat an existing one is dropped and its sources are
+  re-pointed to the surviving edge, and edges that would join a person to
+  themselves are dropped
+- aliases and sources move to the canonical, and a duplicate's display name
+  is kept as an alias when it differs by more than case and spacing
+- the duplicates are deleted (their qa_issues go with them)
+
+The same statements back scripts/deduplicate.py (asyncpg) and MergeService
+(the API's session), so batch and interactive merges behave identically.
+This module is plain SQL with no SQLAlchemy or app imports, so the script
+can use it without loading the web app.
+"""
+
+MERGE_MAP_SQL = """
+    CREATE TEMP TABLE merge_map (
+        duplicate_id uuid PRIMARY KEY,
+        canonical_id uuid NOT NULL,
+        rank integer NOT NULL
+    ) ON COMMIT DROP
+"""
+
+# The new field values of every canonical that gains data from its
+# duplicates: missing fields from the best-ranked duplicate that has them,
+# and the notes of each duplicate (once) appended
+FIELD_UPDATES_SQL = """
+    SELECT c.id AS canonical_id,
+           COALESCE(c.birth_year, d.birth_year) AS birth_year,
+           COALESCE(c.death_year, d.death_year) AS death_year,
+           COALESCE(NULLIF(c.gender, ''), d.gender) AS gender,
+           COALESCE(NULLIF(c.tribal_affiliation, ''), d.tribal_affiliation) AS tribal_affiliation,
+           COALESCE(c.generation, d.generation) AS generation,
+           CASE
+               WHEN d.notes IS NULL THEN c.notes
+               WHEN c.notes IS NULL THEN d.notes
+               ELSE c.notes || E'\\n' || d.notes
+           END AS notes
+    FROM (
+        SELECT m.canonical_id,
+               (array_agg(p.birth_year ORDER BY m.rank) FILTER (WHERE p.birth_year IS NOT NULL))[1] AS birth_year,
+               (array_agg(p.death_year ORDER BY m.rank) FILTER (WHERE p.death_year IS NOT NULL))[1] AS death_year,
+               (array_agg(p.gender ORDER BY m.rank) FILTER (WHERE p.gender <> ''))[1] AS gender,
+               (array_agg(p.tribal_affiliation ORDER BY m.rank)
+                   FILTER (WHERE p.tribal_affiliation <> ''))[1] AS tribal_affiliation,
+               (array_agg(p.generation ORDER BY m.rank) FILTER (WHERE p.generation IS NOT NULL))[1] AS generation,
+               string_agg(p.notes, E'\\n' ORDER BY m.rank)
+                   FILTER (WHERE p.notes <> '' AND p.note_rank = 1
+                           AND strpos(COALESCE(c.notes, ''), p.notes) = 0) AS notes
+        FROM merge_map m
+        JOIN (
+            SELECT p.*, row_number() OVER (PARTITION BY m.canonical_id, p.notes ORDER BY m.rank) AS note_rank
+            FROM merge_map m
+            JOIN persons p ON p.id = m.duplicate_id
+        ) p ON p.id = m.duplicate_id
+        JOIN persons c ON c.id = m.canonical_id
+        GROUP BY m.canonical_id
+    ) d
+    JOIN persons c ON c.id = d.canonical_id
+    WHERE (c.birth_year IS NULL AND d.birth_year IS NOT NULL)
+       OR (c.death_year IS NULL AND d.death_year IS NOT NULL)
+       OR (NULLIF(c.gender, '') IS NULL AND d.gender IS NOT NULL)
+       OR (NULLIF(c.tribal_affiliation, '') IS NULL AND d.tribal_affiliation IS NOT NULL)
+       OR (c.generation IS NULL AND d.generation IS NOT NULL)
+       OR d.notes IS NOT NULL
+"""
+
+# Fills merge_map for one canonical; duplicates rank in the order given
+MERGE_MAP_FILL_SQL = """
+    INSERT INTO merge_map (duplicate_id, canonical_id, rank)
+    SELECT d.id, :canonical_id, d.rank
+    FROM unnest(:duplicate_ids) WITH ORDINALITY AS d(id, rank)
+"""
+
+MERGED_FIELDS = ["birth_year", "death_year", "gender", "tribal_affiliation", "generation", "notes"]
+
+# (label, statement) pairs, run in order after merge_map is filled
+MERGE_STATEMENTS = [
+    ("field_updates", f"""
+        UPDATE persons c
+        SET {", ".join(f"{field} = u.{field}" for field in MERGED_FIELDS)},
+            updated_at = now()
+        FROM ({FIELD_UPDATES_SQL}) u
+        WHERE c.id = u.canonical_id
+    """),
+
+    # Every parent_child row touching a duplicate, with its new endpoints and
+    # the row that will carry the edge afterwards (an existing identical edge
+    # if there is one, else the first moved row)
+    ("parent_child_moves", """
+        CREATE TEMP TABLE pc_rewrite ON COMMIT DROP AS
+        WITH moved AS (
+            SELECT pc.id,
+                   COALESCE(mp.canonical_id, pc.parent_id) AS parent_id,
+                   COALESCE(mc.canonical_id, pc.child_id) AS child_id
+            FROM parent_child pc
+            LEFT JOIN merge_map mp ON mp.duplicate_id = pc.parent_id
+            LEFT JOIN merge_map mc ON mc.duplicate_id = pc.child_id
+            WHERE mp.duplicate_id IS NOT NULL OR mc.duplicate_id IS NOT NULL
+        )
+        SELECT m.id, m.parent_id, m.child_id,
+               COALESCE(e.id, first_value(m.id) OVER (PARTITION BY m.parent_id, m.child_id ORDER BY m.id))
+                   AS keep_id
+        FROM moved m
+        LEFT JOIN parent_child e ON e.parent_id = m.parent_id AND e.child_id = m.child_id
+    """),
+    ("parent_child_sources", """
+        UPDATE sources s SET parent_child_id = r.keep_id
+        FROM pc_rewrite r
+        WHERE s.parent_child_id = r.id AND r.id <> r.keep_id AND r.parent_id <> r.child_id
+    """),
+    ("parent_child_deleted", """
+        DELETE FROM parent_child pc USING pc_rewrite r
+        WHERE pc.id = r.id AND (r.id <> r.keep_id OR r.parent_id = r.child_id)
+    """),
+    ("parent_child_updated", """
+        UPDATE parent_child pc SET parent_id = r.parent_id, child_id = r.child_id
+        FROM pc_rewrite r
+        WHERE pc.id = r.id AND r.id = r.keep_id AND r.parent_id <> r.child_id
+    """),
+
+    # Marriages are unordered pairs: (a, b) and (b, a) are the same edge
+    ("marriage_moves", """
+        CREATE TEMP TABLE marriage_rewrite ON COMMIT DROP AS
+        WITH moved AS (
+            SELECT mr.id,
+                   COALESCE(m1.canonical_id, mr.spouse1_id) AS spouse1_id,
+                   COALESCE(m2.canonical_id, mr.spouse2_id) AS spouse2_id
+            FROM marriages mr
+            LEFT JOIN merge_map m1 ON m1.duplicate_id = mr.spouse1_id
+            LEFT JOIN merge_map m2 ON m2.duplicate_id = mr.spouse2_id
+            WHERE m1.duplicate_id IS NOT NULL OR m2.duplicate_id IS NOT NULL
+        )
+        SELECT m.id, m.spouse1_id, m.spouse2_id,
+               COALESCE(
+                   (SELECT e.id FROM marriages e
+                    WHERE (e.spouse1_id = m.spouse1_id AND e.spouse2_id = m.spouse2_id)
+                       OR (e.spouse1_id = m.spouse2_id AND e.spouse2_id = m.spouse1_id)
+                    ORDER BY e.id LIMIT 1),
+                   first_value(m.id) OVER (
+                       PARTITION BY LEAST(m.spouse1_id, m.spouse2_id), GREATEST(m.spouse1_id, m.spouse2_id)
+                       ORDER BY m.id)
+               ) AS keep_id
+        FROM moved m
+    """),
+    ("marriage_sources", """
+        UPDATE sources s SET marriage_id = r.keep_id
+        FROM marriage_rewrite r
+        WHERE s.marriage_id = r.id AND r.id <> r.keep_id AND r.spouse1_id <> r.spouse2_id
+    """),
+    ("marriages_deleted", """
+        DELETE FROM marriages mr USING marriage_rewrite r
+        WHERE mr.id = r.id AND (r.id <> r.keep_id OR r.spouse1_id = r.spouse2_id)
+    """),
+    ("marriages_updated", """
+        UPDATE marriages mr SET spouse1_id = r.spouse1_id, spouse2_id = r.spouse2_id
+        FROM marriage_rewrite r
+        WHERE mr.id = r.id AND r.id = r.keep_id AND r.spouse1_id <> r.spouse2_id
+    """),
+
+    ("aliases_moved", """
+        UPDATE person_aliases a SET person_id = m.canonical_id
+        FROM merge_map m
+        WHERE a.person_id = m.duplicate_id
+    """),
+    ("aliases_added", """
+        INSERT INTO person_aliases (id, person_id, alias_name, alias_type)
+        SELECT gen_random_uuid(), m.canonical_id, d.display_name, 'alternate'
+        FROM merge_map m
+        JOIN persons d ON d.id = m.duplicate_id
+        JOIN persons c ON c.id = m.canonical_id
+        WHERE lower(regexp_replace(btrim(d.display_name), '\\s+', ' ', 'g'))
+              <> lower(regexp_replace(btrim(c.display_name), '\\s+', ' ', 'g'))
+          AND NOT EXISTS (
+              SELECT 1 FROM person_aliases a
+              WHERE a.person_id = m.canonical_id AND lower(a.alias_name) = lower(d.display_name)
+          )
+        GROUP BY m.canonical_id, d.display_name
+    """),
+    ("sources_moved", """
+        UPDATE sources s SET person_id = m.canonical_id
+        FROM merge_map m
+        WHERE s.person_id = m.duplicate_id
+    """),
+    ("persons_deleted", """
+        DELETE FROM persons p USING merge_map m
+        WHERE p.id = m.duplicate_id
+    """),
+]
+
+
+def status_count(status: str) -> int:
+    """Rows affected, from a command status such as 'UPDATE 12' or 'SELECT 3'."""
+    parts = status.split()
+    return int(parts[-1]) if parts and parts[-1].isdigit() else 0
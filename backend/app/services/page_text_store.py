@@ -0,0 +1,94 @@
+"""Memory-mapped access to the OCR page files that sources point into."""
+
+import mmap
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+
+class PageTextStore:
+    """
+    Serves byte ranges of ocr_output/page-NNN.txt files.
+
+    Each page file is mapped read-only on first use and the mapping is kept
+    for as long as the file's (mtime, size) is unchanged; a rewritten page is
+    mapped again and a missing page is looked up again on the next request.
+    Snippets are sliced out of the mapping through a memoryview, so serving a
+    source neither re-reads the file nor needs the text stored in the database.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        # page -> ((st_mtime_ns, st_size), mapping)
+        self._maps = {}
+
+    def _map(self, page: int) -> Optional[mmap.mmap]:
+        path = self.root / f"page-{page:03d}.txt"
+        try:
+            stat = path.stat()
+        except OSError:
+            self._drop(page)
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._maps.get(page)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        self._drop(page)
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Removed since the stat, or an empty file (which cannot be mapped)
+            return None
+        self._maps[page] = (key, data)
+        return data
+
+    def _drop(self, page: int):
+        cached = self._maps.pop(page, None)
+        if cached is not None:
+            cached[1].close()
+
+    @staticmethod
+    def _decode(data: mmap.mmap, start: int, end: int) -> str:
+        with memoryview(data)[start:end] as view:
+            return str(view, 'utf-8', 'replace').rstrip('\n')
+
+    def snippet(self, page: int, byte_offset: int, byte_end: int, context: int = 0) -> Optional[dict]:
+        """
+        Text of a byte range plus up to `context` whole lines before and after.
+        Returns None if the page file is missing or the range is out of bounds.
+        """
+        data = self._map(page)
+        if data is None or not 0 <= byte_offset <= byte_end <= len(data):
+            return None
+
+        start, end = byte_offset, byte_end
+        for _ in range(context):
+            if start == 0:
+                break
+            start = data.rfind(b'\n', 0, start - 1) + 1
+        for _ in range(context):
+            if end >= len(data):
+                break
+            newline = data.find(b'\n', end)
+            end = len(data) if newline < 0 else newline + 1
+
+        return {
+            'text': self._decode(data, byte_offset, byte_end),
+            'context_before': self._decode(data, start, byte_offset),
+            'context_after': self._decode(data, byte_end, end),
+        }
+
+    def close(self):
+        for _, data in self._maps.values():
+            data.close()
+        self._maps.clear()
+
+
+@lru_cache()
+def get_page_text_store() -> PageTextStore:
+    return PageTextStore(settings.ocr_output_dir)
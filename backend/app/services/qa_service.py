@@ -0,0 +1,126 @@
+"""Data quality checks that run directly against the database."""
+
+from uuid import UUID as PyUUID
+from typing import Iterable, Optional
+
+from sqlalchemy import select, func, case, text, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models import QualityIssue
+from app.services.graph_integrity import GRAPH_QUERIES, graph_issues, component_summary
+from app.services.qa_sql import SQL_CHECKS, REBUILD_STATEMENTS
+
+
+# A person plus their parents, children and spouses: everyone whose issues
+# can change when the person or one of their relationships is edited
+NEIGHBORHOOD_SQL = """
+    SELECT id FROM persons WHERE id = ANY(:person_ids)
+    UNION SELECT parent_id FROM parent_child WHERE child_id = ANY(:person_ids)
+    UNION SELECT child_id FROM parent_child WHERE parent_id = ANY(:person_ids)
+    UNION SELECT spouse2_id FROM marriages WHERE spouse1_id = ANY(:person_ids)
+    UNION SELECT spouse1_id FROM marriages WHERE spouse2_id = ANY(:person_ids)
+"""
+
+PERSON_IDS = bindparam("person_ids", type_=ARRAY(UUID(as_uuid=True)))
+
+
+class QAService:
+    """Service for data quality checks on the live tables."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def run_checks(self) -> dict:
+        """
+        Run all SQL checks, then the graph checks (ancestry cycles, disconnected
+        components). Returns {check title: [issue dicts]}, in check order.
+        """
+        results = {}
+        for check in SQL_CHECKS:
+            rows = await self.session.execute(text(check.query()))
+            results[check.title] = [dict(row) for row in rows.mappings()]
+        results.update(graph_issues(*await self.get_graph_rows()))
+        return results
+
+    async def get_graph_rows(self) -> tuple[list, list, list]:
+        """Person, parent-child and marriage rows for the graph checks."""
+        rows = []
+        for sql in GRAPH_QUERIES.values():
+            result = await self.session.execute(text(sql))
+            rows.append([tuple(row) for row in result.all()])
+        return tuple(rows)
+
+    async def get_components(self) -> dict:
+        """Connected family groups: count, main clan size and sizes, largest first."""
+        return component_summary(*await self.get_graph_rows())
+
+    async def get_neighborhood(self, person_ids: Iterable[PyUUID]) -> list[PyUUID]:
+        """The persons plus their parents, children and spouses."""
+        stmt = text(NEIGHBORHOOD_SQL).bindparams(PERSON_IDS)
+        result = await self.session.execute(stmt, {"person_ids": list(person_ids)})
+        return list(result.scalars().all())
+
+    async def refresh_issues(self, person_ids: Iterable[PyUUID], expand: bool = True) -> int:
+        """
+        Re-validate only the persons around an edit and replace their stored
+        issues. With expand=False the IDs are taken as the full neighborhood
+        (e.g. one computed before a delete). Returns the number of issues stored.
+        """
+        ids = await self.get_neighborhood(person_ids) if expand else list(person_ids)
+        if not ids:
+            return 0
+
+        params = {"person_ids": ids}
+        await self.session.execute(
+            text("DELETE FROM qa_issues WHERE person_id = ANY(:person_ids)").bindparams(PERSON_IDS),
+            params
+        )
+        stored = 0
+        for check in SQL_CHECKS:
+            result = await self.session.execute(text(check.store(scoped=True)).bindparams(PERSON_IDS), params)
+            stored += result.rowcount
+        await self.session.commit()
+        return stored
+
+    async def rebuild_issues(self) -> int:
+        """Re-run every check over the whole database and replace all stored issues."""
+        stored = 0
+        await self.session.execute(text(REBUILD_STATEMENTS[0]))
+        for statement in REBUILD_STATEMENTS[1:]:
+            result = await self.session.execute(text(statement))
+            stored += result.rowcount
+        await self.session.commit()
+        return stored
+
+    async def list_issues(self, severity: Optional[str] = None, issue_type: Optional[str] = None,
+                          limit: int = 100, offset: int = 0) -> tuple[list[QualityIssue], int, dict]:
+        """
+        Stored issues, most severe first, with the total count and counts by type.
+        Filters use the (severity, issue_type) index.
+        """
+        filters = []
+        if severity:
+            filters.append(QualityIssue.severity == severity)
+        if issue_type:
+            filters.append(QualityIssue.issue_type == issue_type)
+
+        counts_stmt = (
+            select(QualityIssue.issue_type, func.count())
+            .where(*filters)
+            .group_by(QualityIssue.issue_type)
+        )
+        by_type = {issue_type: count for issue_type, count in (await self.session.execute(counts_stmt)).all()}
+
+        severity_rank = case({"HIGH": 0, "MEDIUM": 1, "LOW": 2}, value=QualityIssue.severity, else_=3)
+        stmt = (
+            select(QualityIssue)
+            .options(selectinload(QualityIssue.person))
+            .where(*filters)
+            .order_by(severity_rank, QualityIssue.issue_type, QualityIssue.detected_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all()), sum(by_type.values()), by_type
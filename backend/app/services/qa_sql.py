@@ -0,0 +1,126 @@
+"""
+Set-based data quality checks as plain SQL.
+
+Kept free of SQLAlchemy and app imports so the offline asyncpg scripts
+(import_genealogy.py, deduplicate.py, qa_check.py) can run the same
+statements as QAService without loading the web app.
+"""
+
+from typing import NamedTuple
+
+
+class SqlCheck(NamedTuple):
+    """
+    One set-based check returning issue rows: type, severity, person_id, name,
+    birth_year, detail. `subject` is the column holding the ID of the person an
+    issue is reported on; the {scope} placeholder in the query restricts it.
+    """
+    title: str
+    subject: str
+    sql: str
+
+    def query(self, scoped: bool = False) -> str:
+        """The check over all persons, or only those in :person_ids."""
+        scope = f"{self.subject} = ANY(:person_ids)" if scoped else "TRUE"
+        return self.sql.replace("{scope}", scope)
+
+    def store(self, scoped: bool = False) -> str:
+        """INSERT ... SELECT that writes the check's issues into qa_issues."""
+        return f"""
+            INSERT INTO qa_issues (id, person_id, issue_type, severity, detail)
+            SELECT gen_random_uuid(), i.person_id, i.type, i.severity, i.detail
+            FROM ({self.query(scoped)}) i
+        """
+
+
+SQL_CHECKS = [
+    SqlCheck('Parent count', 'pc.child_id', """
+        SELECT 'TOO_MANY_PARENTS' AS type, 'HIGH' AS severity,
+               c.id AS person_id, c.display_name AS name, c.birth_year,
+               'Has ' || pc.parents || ' parents: ' || pc.names AS detail
+        FROM (
+            SELECT pc.child_id, count(*) AS parents,
+                   string_agg(p.display_name, ', ' ORDER BY p.display_name) AS names
+            FROM parent_child pc
+            JOIN persons p ON p.id = pc.parent_id
+            WHERE {scope}
+            GROUP BY pc.child_id
+            HAVING count(*) > 2
+        ) pc
+        JOIN persons c ON c.id = pc.child_id
+    """),
+    SqlCheck('Impossible dates', 'p.id', """
+        SELECT v.type, v.severity, p.id AS person_id, p.display_name AS name,
+               p.birth_year, v.detail
+        FROM persons p
+        CROSS JOIN LATERAL (VALUES
+            (p.birth_year < 1600, 'BIRTH_TOO_EARLY', 'HIGH',
+             'Birth year ' || p.birth_year || ' is before 1600'),
+            (p.birth_year > 2024, 'BIRTH_IN_FUTURE', 'HIGH',
+             'Birth year ' || p.birth_year || ' is in the future'),
+            (p.death_year < 1600, 'DEATH_TOO_EARLY', 'HIGH',
+             'Death year ' || p.death_year || ' is before 1600'),
+            (p.death_year > 2024, 'DEATH_IN_FUTURE', 'HIGH',
+             'Death year ' || p.death_year || ' is in the future'),
+            (p.death_year < p.birth_year, 'DEATH_BEFORE_BIRTH', 'HIGH',
+             'Death (' || p.death_year || ') before birth (' || p.birth_year || ')'),
+            (p.death_year - p.birth_year > 120, 'UNREALISTIC_LIFESPAN', 'MEDIUM',
+             'Lifespan of ' || (p.death_year - p.birth_year) || ' years ('
+             || p.birth_year || '-' || p.death_year || ')')
+        ) AS v(failed, type, severity, detail)
+        WHERE v.failed AND {scope}
+          AND (p.birth_year < 1600 OR p.birth_year > 2024
+               OR p.death_year < 1600 OR p.death_year > 2024
+               OR p.death_year < p.birth_year OR p.death_year - p.birth_year > 120)
+    """),
+    SqlCheck('Parent-child ages', 'pc.child_id', """
+        SELECT CASE
+                   WHEN c.birth_year < p.birth_year THEN 'PARENT_YOUNGER_THAN_CHILD'
+                   WHEN c.birth_year - p.birth_year < 12 THEN 'PARENT_TOO_YOUNG'
+                   ELSE 'PARENT_VERY_OLD'
+               END AS type,
+               CASE WHEN c.birth_year - p.birth_year > 70 THEN 'LOW' ELSE 'HIGH' END AS severity,
+               c.id AS person_id, c.display_name AS name, c.birth_year,
+               CASE
+                   WHEN c.birth_year < p.birth_year THEN
+                       'Parent ' || p.display_name || ' (b. ' || p.birth_year
+                       || ') is younger than child (b. ' || c.birth_year || ')'
+                   WHEN c.birth_year - p.birth_year < 12 THEN
+                       'Parent ' || p.display_name || ' was only '
+                       || (c.birth_year - p.birth_year) || ' when child was born'
+                   ELSE
+                       'Parent ' || p.display_name || ' was '
+                       || (c.birth_year - p.birth_year) || ' when child was born'
+               END AS detail
+        FROM parent_child pc
+        JOIN persons c ON c.id = pc.child_id
+        JOIN persons p ON p.id = pc.parent_id
+        WHERE {scope}
+          AND (c.birth_year - p.birth_year < 12 OR c.birth_year - p.birth_year > 70)
+    """),
+    SqlCheck('Generation consistency', 'pc.child_id', """
+        SELECT 'GENERATION_MISMATCH' AS type, 'MEDIUM' AS severity,
+               c.id AS person_id, c.display_name AS name, c.birth_year,
+               'Child gen ' || c.generation || ', parent ' || p.display_name
+               || ' gen ' || p.generation AS detail
+        FROM parent_child pc
+        JOIN persons c ON c.id = pc.child_id
+        JOIN persons p ON p.id = pc.parent_id
+        WHERE {scope} AND p.generation >= c.generation
+    """),
+    SqlCheck('Orphaned entries', 'p.id', """
+        SELECT 'NO_RELATIONSHIPS' AS type, 'LOW' AS severity,
+               p.id AS person_id, p.display_name AS name, p.birth_year,
+               'Person has no parents, spouses, or children' AS detail
+        FROM persons p
+        WHERE {scope}
+          AND NOT EXISTS (SELECT 1 FROM parent_child pc WHERE pc.child_id = p.id)
+          AND NOT EXISTS (SELECT 1 FROM parent_child pc WHERE pc.parent_id = p.id)
+          AND NOT EXISTS (SELECT 1 FROM marriages m WHERE m.spouse1_id = p.id)
+          AND NOT EXISTS (SELECT 1 FROM marriages m WHERE m.spouse2_id = p.id)
+    """),
+]
+
+
+# Replace all stored issues; plain SQL so the import scripts can run it too
+REBUILD_STATEMENTS = ["DELETE FROM qa_issues"] + [check.store() for check in SQL_CHECKS]
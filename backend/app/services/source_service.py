@@ -0,0 +1,43 @@
+"""Source (provenance) service for genealogy database."""
+
+from uuid import UUID
+from typing import List, Optional
+
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Source, Marriage, ParentChild
+
+
+class SourceService:
+    """Service for source-related operations."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, source_id: UUID) -> Optional[Source]:
+        """Get a source by ID."""
+        return await self.session.get(Source, source_id)
+
+    async def get_for_person(self, person_id: UUID) -> List[Source]:
+        """
+        Get the sources of a person and of the marriages and parent-child
+        relationships they are part of, in page order.
+        """
+        edge_ids = select(ParentChild.id).where(
+            or_(ParentChild.parent_id == person_id, ParentChild.child_id == person_id)
+        )
+        marriage_ids = select(Marriage.id).where(
+            or_(Marriage.spouse1_id == person_id, Marriage.spouse2_id == person_id)
+        )
+        query = (
+            select(Source)
+            .where(or_(
+                Source.person_id == person_id,
+                Source.parent_child_id.in_(edge_ids),
+                Source.marriage_id.in_(marriage_ids),
+            ))
+            .order_by(Source.page, Source.line_start)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark the smart_parser stages.
+
+Times preprocess_lines, parse_line, build_persons_dict, merge_duplicates
+and share_children_between_spouses separately on a real or synthetic OCR
+corpus, and writes the results as JSON so runs can be compared across
+commits.
+
+Usage:
+    python scripts/benchmark_parser.py --ocr-dir ../ocr_output --output bench-before.json
+    python scripts/benchmark_parser.py --synthetic-lines 100000 --output bench.json
+    python scripts/benchmark_parser.py --ocr-dir ../ocr_output --compare bench-before.json
+"""
+
+import gc
+import io
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import smart_parser
+from generate_synthetic_ocr import generate_corpus
+
+
+def git_revision() -> dict:
+    """Current commit and whether the working tree has uncommitted changes."""
+    repo = Path(__file__).parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': bool(status.strip())}
+
+
+def load_corpus(ocr_dir: str, start_page: int, end_page: int) -> dict:
+    """Read all pages once so file I/O stays out of the timings."""
+    pages = list(smart_parser.iter_page_texts(ocr_dir, start_page, end_page))
+    digest = hashlib.sha256()
+    for _, text in pages:
+        digest.update(text.encode('utf-8'))
+    return {
+        'pages': pages,
+        'page_lines': [io.StringIO(text).readlines() for _, text in pages],
+        'sha256': digest.hexdigest(),
+    }
+
+
+def time_stage(setup, run, repeat: int) -> list:
+    """
+    Time run(setup()) repeat times, with only run() inside the clock.
+    Garbage collection is paused while timing, as timeit does.
+    """
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(arg)
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return timings
+
+
+def stage_result(items: int, timings: list) -> dict:
+    best = min(timings)
+    return {
+        'items': items,
+        'best_seconds': round(best, 6),
+        'median_seconds': round(statistics.median(timings), 6),
+        'items_per_second': round(items / best, 1) if best else None,
+        'runs': [round(t, 6) for t in timings],
+    }
+
+
+def run_benchmarks(corpus: dict, repeat: int) -> dict:
+    """Benchmark each parser stage in pipeline order."""
+    sp = smart_parser
+    page_lines = corpus['page_lines']
+    stages = {}
+
+    # preprocess_lines: raw page lines -> joined entry lines
+    joined = [line for lines in page_lines for line in sp.preprocess_lines(lines)]
+    timings = time_stage(lambda: page_lines,
+                         lambda pages: [sp.preprocess_lines(lines) for lines in pages], repeat)
+    stages['preprocess_lines'] = stage_result(sum(map(len, page_lines)), timings)
+
+    # parse_line: joined lines -> ParsedEntry
+    timings = time_stage(lambda: joined, lambda lines: [sp.parse_line(line) for line in lines], repeat)
+    stages['parse_line'] = stage_result(len(joined), timings)
+
+    # build_persons_dict: stitched entries -> person records
+    entries = list(sp.stitch_pages(sp.parse_page(n, text) for n, text in corpus['pages']))
+    timings = time_stage(lambda: entries, sp.build_persons_dict, repeat)
+    stages['build_persons_dict'] = stage_result(len(entries), timings)
+
+    # The last two stages mutate the person records, so each run gets a fresh copy
+    persons = sp.build_persons_dict(entries)
+    timings = time_stage(lambda: sp.build_persons_dict(entries), sp.merge_duplicates, repeat)
+    stages['merge_duplicates'] = stage_result(len(persons), timings)
+
+    merged = sp.merge_duplicates(sp.build_persons_dict(entries))
+    timings = time_stage(lambda: sp.merge_duplicates(sp.build_persons_dict(entries)),
+                         sp.share_children_between_spouses, repeat)
+    stages['share_children_between_spouses'] = stage_result(len(merged), timings)
+
+    return stages
+
+
+def print_results(results: dict, baseline: dict = None):
+    print(f"\n{'=' * 60}")
+    print("Parser Benchmark")
+    print(f"{'=' * 60}")
+    corpus = results['corpus']
+    print(f"Corpus: {corpus['pages']} pages, {corpus['lines']} lines ({corpus['source']})")
+    print(f"Commit: {results['revision']['commit']}{' (dirty)' if results['revision']['dirty'] else ''}")
+
+    if baseline and baseline['corpus']['sha256'] != corpus['sha256']:
+        print("WARNING: baseline was measured on a different corpus")
+
+    print(f"\n{'Stage':<32} {'Best (s)':>10} {'Items/s':>12}", end='')
+    print(f" {'Baseline (s)':>13} {'Speedup':>8}" if baseline else '')
+    for name, stage in results['stages'].items():
+        print(f"{name:<32} {stage['best_seconds']:>10.4f} {stage['items_per_second'] or 0:>12,.0f}",
+              end='')
+        if baseline:
+            before = baseline['stages'].get(name)
+            if before:
+                speedup = before['best_seconds'] / stage['best_seconds'] if stage['best_seconds'] else 0
+                print(f" {before['best_seconds']:>13.4f} {speedup:>7.2f}x")
+            else:
+                print(f" {'-':>13} {'-':>8}")
+        else:
+            print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the smart_parser stages')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--ocr-dir', help='Directory containing OCR page files')
+    source.add_argument('--synthetic-lines', type=int,
+                        help='Benchmark a generated corpus of about this many lines')
+    parser.add_argument('--start-page', type=int, default=3, help='First page to parse')
+    parser.add_argument('--end-page', type=int, help='Last page to parse (default: all)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic corpus')
+    parser.add_argument('--noise', type=float, default=0.3, help='OCR noise for the synthetic corpus')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per stage')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--compare', help='Results JSON from an earlier run to compare against')
+
+    args = parser.parse_args()
+    end_page = args.end_page or sys.maxsize
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic_lines:
+            print(f"Generating synthetic corpus (~{args.synthetic_lines} lines)...")
+            stats = generate_corpus(tmp, args.synthetic_lines, noise=args.noise, seed=args.seed,
+                                    start_page=args.start_page)
+            ocr_dir = tmp
+            end_page = min(end_page, stats['end_page'])
+            source_desc = f"synthetic lines={args.synthetic_lines} seed={args.seed} noise={args.noise}"
+        else:
+            ocr_dir = args.ocr_dir
+            if end_page == sys.maxsize:
+                numbers = [int(p.stem.split('-')[1]) for p in Path(ocr_dir).glob('page-*.txt')]
+                end_page = max(numbers, default=args.start_page)
+            source_desc = ocr_dir
+
+        print("Loading pages...")
+        corpus = load_corpus(ocr_dir, args.start_page, end_page)
+
+    print(f"Timing {len(corpus['pages'])} pages, best of {args.repeat}...")
+    stages = run_benchmarks(corpus, args.repeat)
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'corpus': {
+            'source': source_desc,
+            'pages': len(corpus['pages']),
+            'lines': sum(map(len, corpus['page_lines'])),
+            'sha256': corpus['sha256'],
+        },
+        'stages': stages,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
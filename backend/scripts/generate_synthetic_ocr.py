@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic OCR corpus in the DX Clan book notation.
+
+Writes page-NNN.txt files that look like ocr_output: generation numbers
+with dot indentation, "+" spouse lines, "*" re-listings for additional
+marriages, and dates split across lines the way preprocess_lines has to
+rejoin them. Optional OCR noise garbles punctuation, casing and digits.
+
+The corpus is deterministic for a given seed and is written page by page,
+so it scales from a few thousand to millions of lines.
+
+With --layout, the line geometry an OCR engine would report is written to
+lines.npz as well (see line_store.py): generation numbers sit in a column
+LEVEL_COLUMNS characters further right per generation, spouse and
+re-listing markers in their partner's column, and continuation lines where
+the text after the marker starts. Pages shift left and right a little, and
+lines that noise garbled get a lower confidence.
+
+Usage:
+    python scripts/generate_synthetic_ocr.py --output-dir /tmp/synthetic --lines 100000
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import NamedTuple
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+MALE_NAMES = ['Joseph', 'Louis', 'Napoleon', 'Victor', 'Francis', 'Peter', 'Charles',
+              'William', 'Henry', 'Theodore', 'Bazil', 'Alwin', 'Donald', 'Byron',
+              'Duran', 'Kyle', 'Robert', 'Wayne', 'Frank', 'George', 'Thomas', 'James']
+FEMALE_NAMES = ['Mary', 'Sophia', 'Lillian', 'Angelique', 'Catherine', 'Josephine',
+                'Alvina', 'Naomi', 'Lena', 'Eva', 'Rose', 'Margaret', 'Esther', 'Julia',
+                'Tabitha', 'Sheena', 'Abigail', 'Katrina', 'Dawn', 'Regina', 'Ruth']
+MIDDLE_NAMES = ['Marie', 'Lee', 'Ann', 'Thomas', 'Elvis', 'Beth', 'Rose', 'Joy',
+                'Dean', 'Matthew', 'Cecelia', 'Delano', 'Edwin', 'Lynn', 'Gene']
+SURNAMES = ['Ducheneaux', 'LeCompte', 'LeClaire', 'Spotted Horse', 'Looking Back',
+            'Two Bears', 'Good Iron', 'Yellow', 'Dogskin', 'Fields', 'Summers',
+            'Jensen', 'Oka', 'Soft', 'Farstad', 'High Elk', 'Red Bird', 'Little Thunder']
+SUFFIXES = ['', '', '', '', '', ', Jr', ', Sr', ', II']
+
+# OCR confusions seen in ocr_output
+DIGIT_CONFUSIONS = {'8': 'B', '1': 'l', '0': 'O', '5': 'S'}
+MARKER_CONFUSIONS = {'+': '†', '.': '•', '*': '.*'}
+
+# Page geometry for --layout, in pixels of a 300 DPI scan
+CHAR_WIDTH = 25.0
+LINE_HEIGHT = 58.0
+LEFT_MARGIN = 150.0
+TOP_MARGIN = 200.0
+LEVEL_COLUMNS = 4      # Characters the generation column moves per generation
+PAGE_NUMBER_COLUMN = 40
+
+
+class SyntheticLine(NamedTuple):
+    text: str
+    x: float
+    y: float
+    w: float
+    h: float
+    confidence: float
+    indent: float
+
+
+class PageWriter:
+    """Buffers lines into fixed-size pages and writes each page as it fills."""
+
+    def __init__(self, output_dir: Path, lines_per_page: int, start_page: int, rng: random.Random,
+                 noise: float, layout: bool = False):
+        self.output_dir = output_dir
+        self.lines_per_page = lines_per_page
+        self.page_num = start_page
+        self.rng = rng
+        self.noise = noise
+        self.page = []
+        self.pages_written = 0
+        self.lines_written = 0
+        # (column, garbled) of each line on the page, and the finished pages'
+        # SyntheticLines, when writing the layout. Geometry has its own random
+        # stream so the text is the same with or without it
+        self.layout = layout
+        self.layout_rng = random.Random(f"layout-{start_page}")
+        self.geometry = []
+        self.layout_pages = []
+
+    def add(self, lines: list, geometry: list = None):
+        # Keep an entry's split lines on one page, as the book layout does
+        if self.page and len(self.page) + len(lines) > self.lines_per_page:
+            self.flush()
+        self.page.extend(lines)
+        self.geometry.extend(geometry or [(0, False)] * len(lines))
+
+    def flush(self):
+        if not self.page:
+            return
+        # Stray page numbers are common at the top of OCR pages
+        if self.rng.random() < self.noise:
+            self.page.insert(0, str(self.page_num))
+            self.geometry.insert(0, (PAGE_NUMBER_COLUMN, False))
+        path = self.output_dir / f"page-{self.page_num:03d}.txt"
+        path.write_text('\n'.join(self.page) + '\n', encoding='utf-8')
+        if self.layout:
+            self.layout_pages.append((self.page_num, self.page_lines()))
+        self.lines_written += len(self.page)
+        self.pages_written += 1
+        self.page_num += 1
+        self.page = []
+        self.geometry = []
+
+    def page_lines(self) -> list:
+        """The page's lines with the boxes an OCR engine would report."""
+        rng = self.layout_rng
+        shift = rng.uniform(-40, 40)
+        lines = []
+        for row, (text, (column, garbled)) in enumerate(zip(self.page, self.geometry)):
+            confidence = round(rng.uniform(0.5, 0.85) if garbled else rng.uniform(0.95, 1.0), 3)
+            indent = LEFT_MARGIN + shift + column * CHAR_WIDTH + rng.gauss(0, 3)
+            x = min(LEFT_MARGIN + shift, indent)
+            lines.append(SyntheticLine(text, x, TOP_MARGIN + row * LINE_HEIGHT, len(text) * CHAR_WIDTH,
+                                       LINE_HEIGHT * 0.8, confidence, indent))
+        return lines
+
+    def write_layout(self) -> Path:
+        from line_store import LineStore
+
+        path = self.output_dir / 'lines.npz'
+        LineStore.from_pages(self.layout_pages).save(path)
+        return path
+
+
+class CorpusGenerator:
+    """Produces family trees as book lines until a line budget is reached."""
+
+    def __init__(self, writer: PageWriter, max_lines: int, rng: random.Random, noise: float,
+                 split_dates: float):
+        self.writer = writer
+        self.max_lines = max_lines
+        self.rng = rng
+        self.noise = noise
+        self.split_dates = split_dates
+        self.persons = 0
+
+    @property
+    def full(self) -> bool:
+        return self.writer.lines_written + len(self.writer.page) >= self.max_lines
+
+    def person_name(self, surname: str) -> str:
+        rng = self.rng
+        given = rng.choice(MALE_NAMES if rng.random() < 0.5 else FEMALE_NAMES)
+        middle = f" {rng.choice(MIDDLE_NAMES)}" if rng.random() < 0.6 else ''
+        return f"{given}{middle} {surname}{rng.choice(SUFFIXES)}"
+
+    def date(self, year: int) -> str:
+        return f"{self.rng.choice(MONTHS)} {self.rng.randint(1, 28)}, {year}"
+
+    def dates(self, birth_year: int) -> str:
+        """Date text for a person: full dates, ranges, bare or circa years, or nothing."""
+        rng = self.rng
+        roll = rng.random()
+        death_year = birth_year + rng.randint(1, 90)
+        if roll < 0.45 or death_year > 2020:
+            return self.date(birth_year)
+        if roll < 0.7:
+            return f"{self.date(birth_year)} - {self.date(death_year)}"
+        if roll < 0.8:
+            return f"{birth_year} - {self.date(death_year)}"
+        if roll < 0.87:
+            return f"c. {birth_year}"
+        if roll < 0.93:
+            return str(birth_year)
+        return ''
+
+    def garble(self, line: str) -> str:
+        """Apply OCR-style noise to one line."""
+        rng = self.rng
+        chars = list(line)
+        for i, ch in enumerate(chars):
+            if rng.random() >= self.noise * 0.05:
+                continue
+            if ch in DIGIT_CONFUSIONS:
+                chars[i] = DIGIT_CONFUSIONS[ch]
+            elif ch in MARKER_CONFUSIONS:
+                chars[i] = MARKER_CONFUSIONS[ch]
+            elif ch == ' ':
+                chars[i] = rng.choice(['', '  ', ' . '])
+            elif ch.islower():
+                chars[i] = ch.upper()
+        line = ''.join(chars)
+        if rng.random() < self.noise * 0.1:
+            line = rng.choice(['..', ',', ';', '•', '- ']) + line
+        return line
+
+    def entry_lines(self, prefix: str, name: str, dates: str, sep: str = ' ') -> list:
+        """One entry, possibly split over several lines like the scanned book."""
+        rng = self.rng
+        head = f"{prefix}{sep}{name}"
+        # Only full dates and bare years are split; the book never splits "c." years
+        # or "YYYY - Mon d, YYYY" ranges across lines
+        if (not dates or dates.startswith('c.') or (dates[:4].isdigit() and ' - ' in dates)
+                or rng.random() >= self.split_dates):
+            return [f"{head} {dates}".rstrip()]
+
+        layout = rng.randrange(4)
+        if layout == 1 and sep:
+            # Generation number alone on its own line
+            return [prefix, f"{name} {dates}"]
+        month_day, comma, rest = dates.partition(', ')
+        if layout >= 2 and comma and rest[:4].isdigit():
+            if layout == 2:
+                # "Mon d," at the end of the name line, year on the next
+                return [f"{head} {month_day},", rest]
+            # Month and day on one line, year on the next
+            return [head, f"{month_day},", rest]
+        # Name line followed by a date-only line
+        return [head, dates]
+
+    def emit(self, lines: list, column: int = 0):
+        """Add an entry's lines; column is where its marker sits (text follows 2 further)."""
+        garbled = [self.garble(line) for line in lines]
+        geometry = [(column if k == 0 else column + 2, text != line)
+                    for k, (line, text) in enumerate(zip(lines, garbled))]
+        self.writer.add(garbled, geometry)
+
+    def family(self, generation: int, surname: str, birth_year: int):
+        """Emit one person, their marriages and (recursively) their children."""
+        if self.full:
+            return
+        rng = self.rng
+        self.persons += 1
+        name = self.person_name(surname)
+        dots = '.' * max(0, generation - 1 + rng.randint(-1, 1))
+        column = LEVEL_COLUMNS * generation
+        self.emit(self.entry_lines(f"{dots}{generation}", name, self.dates(birth_year)), column)
+
+        # Spouse and re-listing lines carry at most a few dots
+        marker_dots = '.' * rng.randint(0, 2)
+        marriages = 0 if rng.random() < 0.2 else (2 if rng.random() < 0.15 else 1)
+        for marriage in range(marriages):
+            if marriage:
+                # Re-listing so the next spouse can be shown
+                self.emit([f"{marker_dots}* {name}"], column)
+            spouse_surname = rng.choice(SURNAMES)
+            spouse_birth = birth_year + rng.randint(-8, 8)
+            self.persons += 1
+            self.emit(self.entry_lines(f"{marker_dots}+", self.person_name(spouse_surname),
+                                       self.dates(spouse_birth), sep=''), column)
+
+            if generation >= 9:
+                continue
+            for _ in range(rng.choice([0, 1, 2, 2, 3, 3, 4, 5, 6])):
+                child_birth = birth_year + rng.randint(18, 42)
+                if child_birth > 2015:
+                    break
+                self.family(generation + 1, surname, child_birth)
+
+    def generate(self):
+        rng = self.rng
+        while not self.full:
+            # Start trees at varying depths, like pages in the middle of the book
+            generation = rng.choice([1, 1, 2, 3, 4])
+            self.family(generation, rng.choice(SURNAMES), rng.randint(1790, 1860) + 25 * (generation - 1))
+        self.writer.flush()
+
+
+def generate_corpus(output_dir: str, lines: int = 10000, lines_per_page: int = 50,
+                    noise: float = 0.3, split_dates: float = 0.3, seed: int = 0,
+                    start_page: int = 3, layout: bool = False) -> dict:
+    """Write a synthetic corpus (and with layout, its lines.npz) and return its size statistics."""
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    writer = PageWriter(out, lines_per_page, start_page, rng, noise, layout)
+    generator = CorpusGenerator(writer, lines, rng, noise, split_dates)
+    generator.generate()
+
+    return {
+        'pages': writer.pages_written,
+        'lines': writer.lines_written,
+        'persons': generator.persons,
+        'start_page': start_page,
+        'end_page': writer.page_num - 1,
+        'layout': str(writer.write_layout()) if layout else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic OCR corpus')
+    parser.add_argument('--output-dir', required=True, help='Directory for page-NNN.txt files')
+    parser.add_argument('--lines', type=int, default=10000,
+                        help='Approximate number of lines to generate (1k to 1M)')
+    parser.add_argument('--lines-per-page', type=int, default=50, help='Lines per page file')
+    parser.add_argument('--noise', type=float, default=0.3,
+                        help='OCR noise level from 0 (clean) to 1 (very noisy)')
+    parser.add_argument('--split-dates', type=float, default=0.3,
+                        help='Fraction of dated entries split across lines')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--start-page', type=int, default=3, help='First page number')
+    parser.add_argument('--layout', action='store_true',
+                        help='Also write line geometry to lines.npz (needs numpy)')
+
+    args = parser.parse_args()
+
+    print(f"Generating ~{args.lines} lines into {args.output_dir}...")
+    stats = generate_corpus(args.output_dir, args.lines, args.lines_per_page, args.noise,
+                            args.split_dates, args.seed, args.start_page, args.layout)
+    print(f"  Pages:   {stats['pages']} (page {stats['start_page']} to {stats['end_page']})")
+    print(f"  Lines:   {stats['lines']}")
+    print(f"  Persons: {stats['persons']}")
+    if stats['layout']:
+        print(f"  Layout:  {stats['layout']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Streaming readers and writers for parsed genealogy records.
+
+Records are written one at a time, so exporting never builds the full
+output list in memory. Two formats are supported:
+
+- JSON:   a pretty-printed array, byte-identical to
+          json.dump(records, f, indent=2, ensure_ascii=False)
+- NDJSON: one compact record per line (.ndjson / .jsonl files)
+"""
+
+import json
+from typing import Iterable, Iterator
+
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+
+def is_ndjson(path: str) -> bool:
+    """True if the file extension selects the NDJSON format."""
+    return str(path).lower().endswith(NDJSON_SUFFIXES)
+
+
+def write_json_array(records: Iterable[dict], f) -> int:
+    """Write records as an indented JSON array. Returns the record count."""
+    count = 0
+    f.write('[')
+    for record in records:
+        f.write(',\n  ' if count else '\n  ')
+        # Strings never contain raw newlines, so shifting every line break
+        # nests the record one level deeper inside the array
+        f.write(json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        count += 1
+    f.write('\n]' if count else ']')
+    return count
+
+
+def write_ndjson(records: Iterable[dict], f) -> int:
+    """Write one JSON record per line. Returns the record count."""
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write('\n')
+        count += 1
+    return count
+
+
+def write_records(records: Iterable[dict], path: str) -> int:
+    """Stream records to path, choosing the format from its extension."""
+    writer = write_ndjson if is_ndjson(path) else write_json_array
+    with open(path, 'w', encoding='utf-8') as f:
+        return writer(records, f)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """
+    Yield records from a JSON array or NDJSON file.
+    NDJSON is read line by line; a JSON array is loaded whole.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if is_ndjson(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def load_records(path: str) -> list:
+    """Load all records from a JSON array or NDJSON file."""
+    return list(iter_records(path))
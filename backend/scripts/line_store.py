@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Columnar store of OCR line geometry (requires numpy).
+
+The OCR step (ocr_all_pages.py) writes one row per line of every
+page-NNN.txt file, in file order, so row k of a page is line k + 1 of its
+page file:
+
+    page, line      page number, 1-based line number in the page file
+    x, y, w, h      line box in pixels of the image the engine read (top-left origin)
+    indent          x of the line's first character after any dot leaders
+    confidence      engine confidence for the line, 0 to 1
+    text            the line, as one UTF-8 buffer plus row offsets
+
+Columns are NumPy arrays saved together in one compressed .npz file, so
+the parser loads the whole book in a few array reads and works on all
+pages at once.
+
+In the book, dot leaders start at the left margin and the generation
+number sits in a column that moves right by a fixed step per generation,
+so indent is the real hierarchy signal. indent_levels() fits that step
+across the book (and a left margin per page) from the lines whose
+generation number was read, and turns every indent into a level.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+# Numeric columns and their types, in file order
+COLUMNS = {
+    'page': np.int32,
+    'line': np.int32,
+    'x': np.float32,
+    'y': np.float32,
+    'w': np.float32,
+    'h': np.float32,
+    'indent': np.float32,
+    'confidence': np.float32,
+}
+
+# Fitted generations closer to an indent than this (in steps) are trusted;
+# text that starts half a step in (a name after its number) is not a level
+MAX_LEVEL_RESIDUAL = 0.25
+
+
+class LineStore:
+    """OCR lines as columns: one NumPy array per field, rows in (page, line) order."""
+
+    def __init__(self, columns: dict, text_data: np.ndarray, text_offsets: np.ndarray):
+        self.columns = columns
+        self.text_data = text_data
+        self.text_offsets = text_offsets
+
+    def __len__(self) -> int:
+        return len(self.columns['page'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[tuple]) -> 'LineStore':
+        """
+        Build the store from (page_num, lines) pairs in page order, where
+        each line has text, x, y, w, h, indent and confidence attributes
+        (ocr_backends.OcrLine).
+        """
+        values = {name: [] for name in COLUMNS}
+        encoded = []
+        for page_num, lines in pages:
+            for number, line in enumerate(lines, 1):
+                values['page'].append(page_num)
+                values['line'].append(number)
+                for name in ('x', 'y', 'w', 'h', 'indent', 'confidence'):
+                    values[name].append(getattr(line, name))
+                encoded.append(line.text.encode('utf-8'))
+
+        columns = {name: np.array(values[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+        lengths = np.fromiter((len(text) for text in encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        text_data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(columns, text_data, offsets)
+
+    @classmethod
+    def load(cls, path: str) -> 'LineStore':
+        with np.load(path) as data:
+            columns = {name: data[name] for name in COLUMNS}
+            return cls(columns, data['text_data'], data['text_offsets'])
+
+    def save(self, path: str):
+        # Write then rename so an interrupted run never leaves a truncated file
+        path = Path(path)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez_compressed(tmp_path, text_data=self.text_data, text_offsets=self.text_offsets,
+                            **self.columns)
+        os.replace(tmp_path, path)
+
+    def text(self, row: int) -> str:
+        start, end = self.text_offsets[row], self.text_offsets[row + 1]
+        return self.text_data[start:end].tobytes().decode('utf-8')
+
+    def texts(self) -> list:
+        data = self.text_data.tobytes()
+        offsets = self.text_offsets.tolist()
+        return [data[offsets[k]:offsets[k + 1]].decode('utf-8') for k in range(len(self))]
+
+    def page_bounds(self) -> dict:
+        """page_num -> (first row, end row) of each page's rows."""
+        pages, starts = np.unique(self['page'], return_index=True)
+        ends = np.append(starts[1:], len(self))
+        return {int(page): (int(start), int(end)) for page, start, end in zip(pages, starts, ends)}
+
+
+def fit_indent_step(page_index: np.ndarray, indent: np.ndarray, generation: np.ndarray,
+                    n_pages: int) -> tuple:
+    """
+    Least-squares fit of indent = margin[page] + step * generation, with one
+    step for the book and one margin per page (scans shift left and right).
+    Returns (step, margins); pages without samples get a NaN margin.
+    """
+    counts = np.bincount(page_index, minlength=n_pages)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(page_index, indent, minlength=n_pages) / counts
+        mean_g = np.bincount(page_index, generation, minlength=n_pages) / counts
+    dx = indent - mean_x[page_index]
+    dg = generation - mean_g[page_index]
+    spread = float((dg * dg).sum())
+    if spread == 0:
+        return 0.0, np.full(n_pages, np.nan)
+    step = float((dx * dg).sum()) / spread
+    return step, mean_x - step * mean_g
+
+
+def group_medians(group: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """(Lower) median of values in each group, NaN for empty groups."""
+    order = np.lexsort((values, group))
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    medians = np.full(n_groups, np.nan)
+    present = counts > 0
+    medians[present] = values[order][starts[present] + (counts[present] - 1) // 2]
+    return medians
+
+
+def indent_levels(store: LineStore, generation: np.ndarray, min_samples: int = 3) -> tuple:
+    """
+    Generation level of every row from its indent, fitted on the rows whose
+    generation number was read (generation > 0, others 0).
+
+    A first fit gives the step; each page's margin is then the median of
+    its samples, so misread generation numbers do not pull it, and the
+    samples within a quarter step of that are fitted again. Returns (levels,
+    step): levels is 0 where the indent is not a generation column (text
+    starting mid-step) or the page has fewer than min_samples good samples.
+    """
+    pages, page_index = np.unique(store['page'], return_inverse=True)
+    n_pages = len(pages)
+    indent = store['indent'].astype(np.float64)
+    generation = generation.astype(np.float64)
+    known = generation > 0
+    no_levels = np.zeros(len(store), dtype=np.int8), 0.0
+
+    step, _ = fit_indent_step(page_index[known], indent[known], generation[known], n_pages)
+    if step <= 0:
+        return no_levels
+    margins = group_medians(page_index[known], indent[known] - step * generation[known], n_pages)
+    sample = known & (np.abs((indent - margins[page_index]) / step - generation) <= MAX_LEVEL_RESIDUAL)
+
+    step, margins = fit_indent_step(page_index[sample], indent[sample], generation[sample], n_pages)
+    if step <= 0:
+        return no_levels
+    position = (indent - margins[page_index]) / step
+    levels = np.rint(np.nan_to_num(position, nan=0.0))
+    samples = np.bincount(page_index[sample], minlength=n_pages)
+    valid = ((np.abs(position - levels) <= MAX_LEVEL_RESIDUAL)
+             & (levels >= 1) & (levels <= 9)
+             & (samples[page_index] >= min_samples))
+    return np.where(valid, levels, 0).astype(np.int8), step
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Name lexicon and OCR-aware name correction.
+
+The lexicon is learned from the corpus itself: every name token of every
+parsed entry is counted, as a surname (the last token before any Jr/Sr/II
+suffix) or a given name (the others). Tokens seen at least min_count times
+are trusted; rarer tokens are checked against them:
+
+- a SymSpell-style deletion index maps every string reachable by deleting
+  up to MAX_DELETES characters from a trusted token back to that token, so
+  the candidates for a token come from a fixed number of dictionary lookups
+  (one per delete of the token), however large the lexicon is
+- candidates are ranked by an edit distance in which common OCR confusions
+  (rn/m, l/I, 0/O, ...) are cheap and any other edit costs 1, so "Amold"
+  becomes "Arnold" but "Bernadine" is left alone
+- results are memoized per token and per name
+
+Build the lexicon from the OCR pages (run from backend/):
+
+    python scripts/name_lexicon.py --ocr-dir ../ocr_output --output data/name_lexicon.json
+
+and pass it to the parser with --lexicon.
+"""
+
+import re
+import json
+from collections import Counter, defaultdict
+from typing import Iterable, NamedTuple, Optional
+
+# (as read by OCR, intended) -> cost. Anything not listed costs 1 per
+# inserted, deleted or substituted character. Swaps that also turn one real
+# name into another (Nell/Neil, Mario/Marlo, Mac/Mae) cost more than the
+# default max_cost, so they only count towards a correction with --max-cost.
+OCR_CONFUSIONS = {
+    ('rn', 'm'): 0.3, ('m', 'rn'): 0.3,
+    ('cl', 'd'): 0.3, ('d', 'cl'): 0.3,
+    ('vv', 'w'): 0.3, ('w', 'vv'): 0.3,
+    ('li', 'h'): 0.4, ('ii', 'u'): 0.4,
+    ('I', 'l'): 0.2, ('l', 'I'): 0.2,
+    ('1', 'l'): 0.2, ('1', 'I'): 0.2,
+    ('0', 'O'): 0.2, ('0', 'o'): 0.2, ('O', '0'): 0.2,
+    ('5', 'S'): 0.2, ('8', 'B'): 0.3,
+    ('I', 'r'): 0.4, ('Me', 'Mc'): 0.3,
+    ('i', 'l'): 0.6, ('l', 'i'): 0.6,
+    ('c', 'e'): 0.6, ('e', 'c'): 0.6,
+    ('v', 'y'): 0.4, ('y', 'v'): 0.4,
+    ('h', 'b'): 0.5, ('b', 'h'): 0.5,
+    ('n', 'u'): 0.5, ('u', 'n'): 0.5,
+}
+
+# Confusions by the first character of what OCR read, for the distance loop
+CONFUSIONS_BY_FIRST = defaultdict(list)
+for (observed, intended), confusion_cost in OCR_CONFUSIONS.items():
+    CONFUSIONS_BY_FIRST[observed[0]].append((observed, intended, confusion_cost))
+
+MAX_DELETES = 2
+MIN_TOKEN_LENGTH = 3
+SUFFIXES = frozenset({'jr', 'sr', 'ii', 'iii', 'iv'})
+
+# A token with its surrounding punctuation ("(LaPlante)", "LeBeau,") split off
+TOKEN_RE = re.compile(r"^(\W*)([A-Za-z0-9][A-Za-z0-9']*?)(\W*)$")
+
+
+class TokenCorrection(NamedTuple):
+    original: str
+    corrected: str
+    cost: float
+
+
+def ocr_distance(observed: str, intended: str) -> float:
+    """
+    Edit distance from what OCR read to an intended spelling, with the
+    OCR_CONFUSIONS substitutions at their (lower) cost.
+    """
+    n, m = len(observed), len(intended)
+    inf = float('inf')
+    dist = [[inf] * (m + 1) for _ in range(n + 1)]
+    dist[0][0] = 0.0
+    for i in range(n + 1):
+        row = dist[i]
+        for j in range(m + 1):
+            cost = row[j]
+            if cost == inf:
+                continue
+            if i < n and cost + 1 < dist[i + 1][j]:
+                dist[i + 1][j] = cost + 1
+            if j < m and cost + 1 < row[j + 1]:
+                row[j + 1] = cost + 1
+            if i < n and j < m:
+                step = cost + (0 if observed[i] == intended[j] else 1)
+                if step < dist[i + 1][j + 1]:
+                    dist[i + 1][j + 1] = step
+                for src, dst, confusion_cost in CONFUSIONS_BY_FIRST.get(observed[i], ()):
+                    if observed.startswith(src, i) and intended.startswith(dst, j):
+                        i2, j2 = i + len(src), j + len(dst)
+                        if cost + confusion_cost < dist[i2][j2]:
+                            dist[i2][j2] = cost + confusion_cost
+    return dist[n][m]
+
+
+def deletes(word: str, max_deletes: int = MAX_DELETES) -> set:
+    """The word and every string made by deleting up to max_deletes characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_deletes):
+        frontier = {w[:k] + w[k + 1:] for w in frontier if len(w) > 1 for k in range(len(w))}
+        found |= frontier
+    return found
+
+
+def name_roles(name: str) -> list:
+    """
+    (prefix, token, suffix, role) for each word of a name. token is None for
+    words that are not name tokens (initials, suffixes, punctuation); role is
+    'surname' for the last name token and 'given' for the others.
+    """
+    words = []
+    for word in name.split():
+        match = TOKEN_RE.match(word)
+        if not match or len(match.group(2)) < MIN_TOKEN_LENGTH or match.group(2).lower() in SUFFIXES:
+            words.append((word, None, '', None))
+        else:
+            words.append((match.group(1), match.group(2), match.group(3), 'given'))
+
+    for k in range(len(words) - 1, -1, -1):
+        if words[k][1] is not None:
+            words[k] = words[k][:3] + ('surname',)
+            break
+    return words
+
+
+class NameLexicon:
+    """Token counts by role, with a deletion index over the trusted tokens."""
+
+    def __init__(self, given: dict, surname: dict, min_count: int = 3, max_cost: float = 0.5):
+        self.counts = {'given': Counter(given), 'surname': Counter(surname)}
+        self.total = self.counts['given'] + self.counts['surname']
+        self.min_count = min_count
+        self.max_cost = max_cost
+
+        self.words = {word for word, count in self.total.items() if count >= min_count}
+        self.index = defaultdict(list)
+        for word in self.words:
+            for key in deletes(word):
+                self.index[key].append(word)
+
+        self._tokens = {}
+        self._names = {}
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], min_count: int = 3, max_cost: float = 0.5) -> 'NameLexicon':
+        """Learn the lexicon from the names of parsed entries (one per appearance)."""
+        counts = {'given': Counter(), 'surname': Counter()}
+        for name in names:
+            for _, token, _, role in name_roles(name):
+                if token is not None:
+                    counts[role][token] += 1
+        return cls(counts['given'], counts['surname'], min_count, max_cost)
+
+    @classmethod
+    def load(cls, path: str, max_cost: float = None) -> 'NameLexicon':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['given'], data['surname'], data['min_count'],
+                   max_cost if max_cost is not None else data.get('max_cost', 0.5))
+
+    def save(self, path: str):
+        data = {
+            'min_count': self.min_count,
+            'max_cost': self.max_cost,
+            'given': dict(self.counts['given'].most_common()),
+            'surname': dict(self.counts['surname'].most_common()),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def correct_token(self, token: str, role: str) -> Optional[TokenCorrection]:
+        """
+        The trusted token a rare token is an OCR misreading of, or None.
+        Among the cheapest candidates within max_cost, the one most often
+        seen in the same role wins; an unresolved tie is left alone.
+        """
+        key = (token, role)
+        if key in self._tokens:
+            return self._tokens[key]
+
+        correction = None
+        if token not in self.words:
+            candidates = {word for k in deletes(token) for word in self.index.get(k, ())}
+            scored = sorted(
+                ((ocr_distance(token, word), -self.counts[role][word], -self.total[word], word)
+                 for word in candidates),
+            )
+            if scored and scored[0][0] <= self.max_cost:
+                best = scored[0]
+                if len(scored) == 1 or scored[1][:3] != best[:3]:
+                    correction = TokenCorrection(token, best[3], round(best[0], 2))
+
+        self._tokens[key] = correction
+        return correction
+
+    def correct_name(self, name: str) -> tuple:
+        """The name with its tokens corrected, and the TokenCorrections made."""
+        if name in self._names:
+            return self._names[name]
+
+        words = []
+        corrections = []
+        for prefix, token, suffix, role in name_roles(name):
+            correction = self.correct_token(token, role) if token is not None else None
+            if correction:
+                corrections.append(correction)
+                token = correction.corrected
+            words.append(prefix + (token or '') + suffix)
+
+        result = (' '.join(words) if corrections else name, corrections)
+        self._names[name] = result
+        return result
+
+
+def main():
+    import argparse
+    import time
+    from smart_parser import parse_ocr_pages
+
+    parser = argparse.ArgumentParser(description='Learn the name lexicon used for OCR name correction')
+    parser.add_argument('--ocr-dir', default='../ocr_output',
+                        help='Directory containing OCR page files')
+    parser.add_argument('--output', default='data/name_lexicon.json',
+                        help='Lexicon JSON file to write')
+    parser.add_argument('--start-page', type=int, default=3,
+                        help='First page to read (skip index)')
+    parser.add_argument('--end-page', type=int, default=251,
+                        help='Last page to read')
+    parser.add_argument('--min-count', type=int, default=3,
+                        help='Appearances for a token to be trusted')
+    parser.add_argument('--max-cost', type=float, default=0.5,
+                        help='Highest OCR edit cost a correction may have')
+    parser.add_argument('--show', type=int, default=40,
+                        help='Print this many of the corrections the lexicon would make')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    names = [entry.name for entry, _, _ in parse_ocr_pages(args.ocr_dir, args.start_page, args.end_page)]
+    lexicon = NameLexicon.from_names(names, args.min_count, args.max_cost)
+    lexicon.save(args.output)
+
+    corrections = Counter()
+    for name in names:
+        for correction in lexicon.correct_name(name)[1]:
+            corrections[correction] += 1
+
+    print(f"\n{'=' * 60}")
+    print("DX Clan Genealogy - Name Lexicon")
+    print(f"{'=' * 60}\n")
+    print(f"Entries read: {len(names)}")
+    print(f"Distinct tokens: {len(lexicon.total)} "
+          f"({len(lexicon.counts['given'])} given, {len(lexicon.counts['surname'])} surname)")
+    print(f"Trusted tokens (seen >= {args.min_count} times): {len(lexicon.words)}")
+    print(f"Deletion index keys: {len(lexicon.index)}")
+    print(f"Token corrections: {len(corrections)} distinct, {sum(corrections.values())} total")
+    for correction, count in corrections.most_common(args.show):
+        print(f"  {correction.original} -> {correction.corrected} "
+              f"(cost {correction.cost}, {count}x)")
+    print(f"\nLexicon written to {args.output} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Stage-level profiling for the OCR -> database pipeline scripts.
+
+A Profiler records per-stage wall time, CPU time, item counts and peak RSS,
+plus named counters (e.g. how often each preprocess_lines join rule fires),
+and writes them as JSON. Scripts expose it through a --profile flag:
+
+    --profile            print the profile JSON after the run
+    --profile out.json   write it to a file
+
+Stages can be nested or streamed: time is always charged to the innermost
+active stage, so the stages of a generator pipeline get exclusive timings
+even though they run interleaved.
+"""
+
+import sys
+import json
+import time
+import resource
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    """Peak resident set size so far, in MB."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def add_profile_argument(parser):
+    """Add the standard --profile flag to an argparse parser."""
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help='Emit per-stage timings and counters as JSON (to FILE, or stdout)')
+
+
+class Stage:
+    """Accumulated measurements for one named stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.items = 0
+        self.peak_rss_mb = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'items': self.items,
+            'items_per_second': round(self.items / self.wall, 1) if self.items and self.wall else None,
+            'peak_rss_mb': self.peak_rss_mb,
+        }
+
+
+class Profiler:
+    """
+    Collects stage timings and counters for one script run.
+
+    A disabled profiler still counts items (scripts use the counts in their
+    progress output) but takes no timings.
+    """
+
+    def __init__(self, script: str, enabled: bool = True):
+        self.script = script
+        self.enabled = enabled
+        self.stages = {}
+        self.counters = defaultdict(lambda: defaultdict(int))
+        self._active = []
+        self._started = datetime.now(timezone.utc)
+        self._start = (time.perf_counter(), time.process_time())
+        self._mark = self._start
+
+    def _stage(self, name: str) -> Stage:
+        if name not in self.stages:
+            self.stages[name] = Stage(name)
+        return self.stages[name]
+
+    def _switch(self):
+        """Charge the time since the last switch to the innermost active stage."""
+        now = (time.perf_counter(), time.process_time())
+        if self._active:
+            stage = self._active[-1]
+            stage.wall += now[0] - self._mark[0]
+            stage.cpu += now[1] - self._mark[1]
+        self._mark = now
+
+    def _enter(self, stage: Stage):
+        self._switch()
+        self._active.append(stage)
+
+    def _exit(self):
+        self._switch()
+        stage = self._active.pop()
+        stage.peak_rss_mb = max(stage.peak_rss_mb, peak_rss_mb())
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block. Set .items on the yielded Stage to report throughput."""
+        stage = self._stage(name)
+        if not self.enabled:
+            yield stage
+            return
+        self._enter(stage)
+        try:
+            yield stage
+        finally:
+            self._exit()
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Pass items through, charging the time spent producing them to a stage."""
+        # Register the stage now so stages report in pipeline order
+        return self._iterate(self._stage(name), iterable)
+
+    def _iterate(self, stage: Stage, iterable: Iterable) -> Iterator:
+        if not self.enabled:
+            for item in iterable:
+                stage.items += 1
+                yield item
+            return
+
+        iterator = iter(iterable)
+        while True:
+            self._enter(stage)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            stage.items += 1
+            yield item
+
+    def items(self, name: str) -> int:
+        """Items seen so far by a stage."""
+        return self._stage(name).items
+
+    def count(self, group: str, key: str, n: int = 1):
+        """Increment a counter, e.g. count('issues', 'TOO_MANY_PARENTS')."""
+        self.counters[group][key] += n
+
+    def add_counts(self, group: str, counts: dict):
+        """Merge a dict of counts into a counter group."""
+        target = self.counters[group]
+        for key, n in counts.items():
+            target[key] += n
+
+    def report(self) -> dict:
+        wall = time.perf_counter() - self._start[0]
+        cpu = time.process_time() - self._start[1]
+        return {
+            'script': self.script,
+            'started': self._started.isoformat(timespec='seconds'),
+            'total': {
+                'wall_seconds': round(wall, 6),
+                'cpu_seconds': round(cpu, 6),
+                'peak_rss_mb': peak_rss_mb(),
+                # Worker processes that have exited, e.g. a parsing pool
+                'children_peak_rss_mb': peak_rss_mb(resource.RUSAGE_CHILDREN),
+            },
+            'stages': [stage.to_dict() for stage in self.stages.values()],
+            'counters': {group: dict(sorted(counts.items())) for group, counts in self.counters.items()},
+        }
+
+    def write(self, destination: str):
+        """Write the report as JSON to a file, or to stdout for '-'."""
+        if not self.enabled:
+            return
+        report = json.dumps(self.report(), indent=2)
+        if destination == '-':
+            print(report)
+        else:
+            with open(destination, 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+            print(f"Profile written to {destination}")
@@ -0,0 +1,134 @@
+"""
+Similarity helpers for duplicate detection.
+
+- soundex(): American Soundex code, used as a phonetic blocking key so
+  OCR variants of a surname ("Ducheneaux" / "Duchenaux") land in one block
+- jaro_winkler(): similarity in [0, 1] that rewards a shared prefix, which
+  suits names where OCR errors are scattered single characters
+- context_similarity(): Jaccard similarity of two records' relatives. Same
+  name plus shared spouses or children is almost surely one person; same
+  name with disjoint families is usually two. Contexts are role-tagged
+  sets built in bulk (relationship_context for ID edges from the database,
+  person_context for the parser's name lists)
+"""
+
+import re
+from collections import defaultdict
+from typing import Iterable, Optional
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+NON_LETTERS_RE = re.compile(r'[^a-z]')
+
+
+def soundex(word: str) -> str:
+    """Four-character Soundex code ('' for a word with no letters)."""
+    letters = NON_LETTERS_RE.sub('', word.lower())
+    if not letters:
+        return ''
+
+    code = [letters[0].upper()]
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for ch in letters[1:]:
+        digit = SOUNDEX_CODES.get(ch, '')
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if ch not in 'hw':
+            previous = digit
+    return ''.join(code).ljust(4, '0')
+
+
+def jaro(a: str, b: str) -> float:
+    """Jaro similarity of two strings."""
+    if a == b:
+        return 1.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    matched_b = [False] * len_b
+    matches_a = []
+    for i, ch in enumerate(a):
+        lo, hi = max(0, i - window), min(len_b, i + window + 1)
+        for j in range(lo, hi):
+            if not matched_b[j] and b[j] == ch:
+                matched_b[j] = True
+                matches_a.append(ch)
+                break
+    matches = len(matches_a)
+    if not matches:
+        return 0.0
+
+    matches_b = [b[j] for j in range(len_b) if matched_b[j]]
+    transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) // 2
+    return (matches / len_a + matches / len_b + (matches - transpositions) / matches) / 3
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """Jaro-Winkler similarity: Jaro boosted by a common prefix of up to 4 characters."""
+    similarity = jaro(a, b)
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return similarity + prefix * prefix_scale * (1 - similarity)
+
+
+def relationship_context(parent_child: Iterable[tuple], marriages: Iterable[tuple]) -> dict:
+    """
+    Role-tagged neighbor sets from (parent, child) and (spouse1, spouse2)
+    pairs: person -> {('parent', p), ('child', c), ('spouse', s), ...}.
+    """
+    context = defaultdict(set)
+    for parent, child in parent_child:
+        context[child].add(('parent', parent))
+        context[parent].add(('child', child))
+    for spouse1, spouse2 in marriages:
+        context[spouse1].add(('spouse', spouse2))
+        context[spouse2].add(('spouse', spouse1))
+    return context
+
+
+def person_context(parents: Iterable[str], spouses: Iterable[str], children: Iterable[str]) -> set:
+    """Role-tagged neighbor set for relatives known only by name."""
+    def key(name: str) -> str:
+        return ' '.join(name.lower().split())
+
+    return ({('parent', key(n)) for n in parents}
+            | {('spouse', key(n)) for n in spouses}
+            | {('child', key(n)) for n in children})
+
+
+def context_similarity(a: set, b: set, name_threshold: float = None) -> Optional[float]:
+    """
+    Jaccard similarity of two role-tagged neighbor sets, or None when either
+    record has no relatives (no evidence either way).
+
+    With name_threshold, relatives known by name also match when they have
+    the same role and Jaro-Winkler similarity >= name_threshold, so OCR
+    variants of a relative's name still count as shared.
+    """
+    if not a or not b:
+        return None
+    shared = len(a & b)
+    if name_threshold is not None and shared < min(len(a), len(b)):
+        unmatched = b - a
+        for role, name in a - b:
+            match = next((other for other in unmatched
+                          if other[0] == role and jaro_winkler(name, other[1]) >= name_threshold), None)
+            if match:
+                shared += 1
+                unmatched.discard(match)
+    return shared / (len(a) + len(b) - shared)
@@ -10,15 +10,36 @@ Key insights:
 - + or † indicates a spouse
 - * indicates a second/subsequent spouse listing
 - Dots/periods are unreliable due to OCR noise
+
+With --lexicon, names are also checked against a lexicon learned from the
+corpus (see name_lexicon.py) and OCR letter confusions such as rn/m or l/I
+are corrected; every correction is written to an audit log.
+
+With --layout, the line geometry written by the OCR step (lines.npz, see
+line_store.py) is read as well: the indentation of each line gives its
+generation, which recovers generation numbers OCR misread as letters or
+punctuation (and spouse markers hidden behind noise) and overrides misread
+digits, and each entry carries the OCR confidence of its lines.
 """
 
 import re
+import io
 import os
-import json
-from dataclasses import dataclass, field, asdict
-from typing import Optional
+import sys
+import pickle
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, asdict, astuple
+from typing import Iterable, Iterator, NamedTuple, Optional
 from pathlib import Path
 
+from json_stream import write_records
+from pipeline_profile import Profiler, add_profile_argument
+from similarity import person_context, context_similarity
+from name_lexicon import NameLexicon
+
 
 @dataclass
 class Person:
@@ -37,6 +58,12 @@ class Person:
     spouses: list = field(default_factory=list)
     children: list = field(default_factory=list)
 
+    # Provenance (see entry_provenance): the line of the first appearance,
+    # and for each parent/spouse name the line that established the link
+    provenance: Optional[dict] = None
+    parent_sources: dict = field(default_factory=dict)
+    spouse_sources: dict = field(default_factory=dict)
+
 
 @dataclass
 class ParsedEntry:
@@ -50,48 +77,131 @@ class ParsedEntry:
     death_year: Optional[int]
     death_year_circa: bool
     raw_line: str
+    # Where the entry came from in its page file: 1-based line numbers and
+    # the byte range of those lines (None when parsed outside a page)
+    line_start: Optional[int] = None
+    line_end: Optional[int] = None
+    byte_offset: Optional[int] = None
+    byte_end: Optional[int] = None
+    # Lowest OCR confidence of those lines (None without --layout)
+    confidence: Optional[float] = None
+
+
+# ---------------------------------------------------------------------------
+# Line tokenizer
+#
+# Every pattern is compiled once at import time. tokenize_line() splits a line
+# into its marker, generation, date and name parts in one pass; extract_years(),
+# clean_name() and parse_line() are thin views over the same scanners.
+# ---------------------------------------------------------------------------
+
+OCR_NOISE = r'[•.*†+,;:\-/\s]*'
+
+# Lines that are never person entries
+PAGE_NUMBER_RE = re.compile(r'^\d+$')
+INDEX_ENTRY_RE = re.compile(r'^[A-Za-z]+,\s*[A-Za-z]+\.+\s*\d+$')
+
+# Spouse / re-listing / generation markers
+SPOUSE_PREFIXES = ('+', '†', '.+', '..+', '...+')
+RELISTING_PREFIXES = ('*', '.*', '..*', '...*')
+RELISTING_MARKER_RE = re.compile(r'^[.*]+\s*')
+GENERATION_RE = re.compile(r'^' + OCR_NOISE + r'(\d)\s+')
+GENERATION_INLINE_RE = re.compile(r'(?:^|\s)(\d)\s+[A-Z]')
+
+# Date tokens
+YEAR_RANGE_RE = re.compile(r'(\d{4})\s*[-–—]\s*(?:[A-Za-z]+\s+\d+,?\s*)?(\d{4})')
+FULL_DATE_RE = re.compile(r'([A-Za-z]+)\s+(\d{1,2}),?\s*(\d{4})')
+BARE_YEAR_RE = re.compile(r'\b(1[6-9]\d{2}|20[0-2]\d)\b')
+CIRCA_YEAR_RE = re.compile(r'c\.?\s*(\d{4})')
+
+# Name cleanup, in the order they are applied
+NAME_FULL_DATE_RE = re.compile(r'[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}')
+NAME_YEAR_RE = re.compile(r'\b\d{4}\b')
+NAME_PARTIAL_DATE_RE = re.compile(r'\s+[A-Za-z]{3}\s+\d+[A-Za-z]?[;:,]?\s*\d*\s*(\([a-z]\))?\s*$')
+NAME_BROKEN_DATE_RE = re.compile(r'\s*-?\s*[A-Za-z]{3}\s+\d{1,2},?\s*\d+\s*\d*[A-Za-z]?\s*$')
+NAME_TRAILING_NUMBER_RE = re.compile(r'\s+\d+\s*$')
+NAME_GARBAGE_WORD_RE = re.compile(r'\s+[a-z]+\s+\d+[,;]?\s*$')
+NAME_GARBAGE_CODE_RE = re.compile(r'\s+[A-Z]\d+\s*$')
+NAME_PAREN_NOTE_RE = re.compile(r'\([a-z]+\)\s*')
+NAME_TRAILING_DASH_RE = re.compile(r'\s*[-–]\s*$')
+NAME_LATE_DATE_RE = re.compile(r'\s+[A-Za-z]{3}\s+\d+[A-Za-z]?[;:,]?\s*\d*\s*$')
+NAME_EDGE_PUNCT_RE = re.compile(r'^[,\-\s]+|[,\-\s]+$')
+NAME_LEADING_GEN_RE = re.compile(r'^(\d)\s+(?=[A-Z])')
+NAME_LEADING_DIGITS_RE = re.compile(r'^[\d\s]+(?=[A-Za-z])')
+
+# Markers become spaces, colons/semicolons become spaces, OCR artifacts are
+# dropped. Whitespace is collapsed afterwards, so one table covers all three.
+NAME_SYMBOLS = str.maketrans(
+    {**{c: ' ' for c in '•†*+.:;'}, **{c: None for c in '—~=|\\@#$%^&<>'}}
+)
+
+# Name validation
+HAS_LETTER_RE = re.compile(r'[A-Za-z]')
+ONLY_NUMERIC_RE = re.compile(r'^[\d\s\.\-\,\+]+$')
+DATE_LIKE_RE = re.compile(r'^[A-Za-z]{3,4}\s+\d+$')
+LOWERCASE_GARBAGE_RE = re.compile(r'^[a-z]+[\s\'\d]+$')
+NAME_SUFFIX_RE = re.compile(r',?\s*(Jr|Sr|II|III|IV|I)\s*$', re.IGNORECASE)
+INNER_NUMBER_RE = re.compile(r'\s\d+\s')
+
+DIGITS = frozenset('0123456789')
+
+
+def has_digit(text: str) -> bool:
+    """Cheap check used to skip the date patterns on lines without numbers."""
+    return not DIGITS.isdisjoint(text)
 
 
-def extract_years(text: str) -> tuple:
-    """
-    Extract birth and death years from a text string.
-    Returns (birth_year, birth_circa, death_year, death_circa)
-    """
+@dataclass
+class LineTokens:
+    """A genealogy line split into marker, generation, date and name tokens."""
+    generation: Optional[int]
+    is_spouse: bool
+    is_relisting: bool
+    body: str  # Line text after the markers, holding the name and dates
+    birth_year: Optional[int] = None
+    birth_year_circa: bool = False
+    death_year: Optional[int] = None
+    death_year_circa: bool = False
+    name: str = ""
+
+    @property
+    def name_tokens(self) -> list:
+        return self.name.split()
+
+
+def scan_years(text: str) -> tuple:
+    """Date tokens of a line as (birth_year, birth_circa, death_year, death_circa)."""
+    if not has_digit(text):
+        return None, False, None, False
+
     birth_year = None
     death_year = None
-    birth_circa = False
-    death_circa = False
 
-    # Pattern for date ranges like "Sep 14, 1910 - Jul 20, 1981" or "1893 - Dec 21, 1915"
-    # The pattern handles: YEAR - [optional month day] YEAR
-    # Include em-dash and en-dash variants
-    range_pattern = r'(\d{4})\s*[-–—]\s*(?:[A-Za-z]+\s+\d+,?\s*)?(\d{4})'
-    range_match = re.search(range_pattern, text)
+    # Date ranges like "Sep 14, 1910 - Jul 20, 1981" or "1893 - Dec 21, 1915"
+    range_match = YEAR_RANGE_RE.search(text)
     if range_match:
         birth_year = int(range_match.group(1))
         death_year = int(range_match.group(2))
-        # Skip the date_pattern logic since we already found the range
     else:
-        # Pattern for full dates like "May 3, 1941"
-        date_pattern = r'([A-Za-z]+)\s+(\d{1,2}),?\s*(\d{4})'
-        dates = re.findall(date_pattern, text)
+        # Full dates like "May 3, 1941"
+        dates = FULL_DATE_RE.findall(text)
 
         if len(dates) >= 2:
             birth_year = int(dates[0][2])
             death_year = int(dates[1][2])
         elif len(dates) == 1:
             # Single date - check context
-            if 'b.' in text.lower() or '-' not in text:
+            lowered = text.lower()
+            if 'b.' in lowered or '-' not in text:
                 birth_year = int(dates[0][2])
-            elif 'd.' in text.lower():
+            elif 'd.' in lowered:
                 death_year = int(dates[0][2])
             else:
                 birth_year = int(dates[0][2])
 
     # Try simpler year patterns if no dates found
     if birth_year is None and death_year is None:
-        year_pattern = r'\b(1[6-9]\d{2}|20[0-2]\d)\b'
-        years = re.findall(year_pattern, text)
+        years = BARE_YEAR_RE.findall(text)
 
         if len(years) >= 2:
             birth_year = int(years[0])
@@ -99,11 +209,13 @@ def extract_years(text: str) -> tuple:
         elif len(years) == 1:
             birth_year = int(years[0])
 
-    # Check for circa indicators
-    if birth_year and re.search(r'c\.?\s*' + str(birth_year), text):
-        birth_circa = True
-    if death_year and re.search(r'c\.?\s*' + str(death_year), text):
-        death_circa = True
+    # Circa indicators: one scan collects every "c. YYYY" in the line
+    birth_circa = False
+    death_circa = False
+    if birth_year or death_year:
+        circa_years = set(CIRCA_YEAR_RE.findall(text)) if 'c' in text else ()
+        birth_circa = bool(birth_year) and str(birth_year) in circa_years
+        death_circa = bool(death_year) and str(death_year) in circa_years
 
     # Validate years are reasonable (1650-2025)
     # Reject obvious OCR errors like 199, 1097, 9694
@@ -126,58 +238,127 @@ def extract_years(text: str) -> tuple:
     return birth_year, birth_circa, death_year, death_circa
 
 
-def clean_name(text: str) -> str:
-    """Extract and clean the person's name from text."""
-    # Remove date information (full dates like "May 30, 1982")
-    name = re.sub(r'[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}', '', text)
-    name = re.sub(r'\b\d{4}\b', '', name)
+def scan_name(text: str) -> str:
+    """Name tokens of a line, with dates, markers and OCR garbage removed."""
+    name = text
+    if has_digit(name):
+        # Remove date information (full dates like "May 30, 1982")
+        name = NAME_FULL_DATE_RE.sub('', name)
+        name = NAME_YEAR_RE.sub('', name)
 
-    # Remove partial dates stuck at end, including with trailing garbage
-    # Handles: "Jun 29", "Aug 1B", "Mar 1B, (a)", "Oct 30, 197", "Apr 29"
-    name = re.sub(r'\s+[A-Za-z]{3}\s+\d+[A-Za-z]?[;:,]?\s*\d*\s*(\([a-z]\))?\s*$', '', name)
+        # Remove partial dates stuck at end, including with trailing garbage
+        # Handles: "Jun 29", "Aug 1B", "Mar 1B, (a)", "Oct 30, 197", "Apr 29"
+        name = NAME_PARTIAL_DATE_RE.sub('', name)
 
-    # Remove dates with full format but OCR errors (like "Jul 2, 19 78" or "Feb 6, 198B")
-    name = re.sub(r'\s*-?\s*[A-Za-z]{3}\s+\d{1,2},?\s*\d+\s*\d*[A-Za-z]?\s*$', '', name)
+        # Remove dates with full format but OCR errors (like "Jul 2, 19 78" or "Feb 6, 198B")
+        name = NAME_BROKEN_DATE_RE.sub('', name)
 
-    # Remove trailing numbers (like "78" at end of "Brandy Lee Goff 78")
-    name = re.sub(r'\s+\d+\s*$', '', name)
+        # Remove trailing numbers (like "78" at end of "Brandy Lee Goff 78")
+        name = NAME_TRAILING_NUMBER_RE.sub('', name)
 
-    # Remove OCR garbage fragments (like "sua 19," or "E991")
-    name = re.sub(r'\s+[a-z]+\s+\d+[,;]?\s*$', '', name)
-    name = re.sub(r'\s+[A-Z]\d+\s*$', '', name)
+        # Remove OCR garbage fragments (like "sua 19," or "E991")
+        name = NAME_GARBAGE_WORD_RE.sub('', name)
+        name = NAME_GARBAGE_CODE_RE.sub('', name)
 
     # Remove parenthetical notes like "(baby)" or "(a)"
-    name = re.sub(r'\([a-z]+\)\s*', '', name)
+    if '(' in name:
+        name = NAME_PAREN_NOTE_RE.sub('', name)
 
     # Remove common suffixes that got separated
-    name = re.sub(r'\s*[-–]\s*$', '', name)
+    name = NAME_TRAILING_DASH_RE.sub('', name)
+
+    # Remove markers, colons/semicolons and OCR artifacts, then clean up
+    name = ' '.join(name.translate(NAME_SYMBOLS).split())
 
-    # Remove various markers (including colons and semicolons)
-    name = re.sub(r'[•†*+\.]+', ' ', name)
+    if has_digit(name):
+        # Run date removal again after cleanup (catches more cases)
+        name = NAME_LATE_DATE_RE.sub('', name)
 
-    # Replace colons and semicolons with space (they shouldn't be in names)
-    name = re.sub(r'[:;]', ' ', name)
+    # Remove leading/trailing punctuation
+    name = NAME_EDGE_PUNCT_RE.sub('', name)
 
-    # Remove OCR artifacts (em-dash, tilde, equals, etc.)
-    name = re.sub(r'[—~=|\\@#$%^&*<>]', '', name)
+    if name[:1] in DIGITS:
+        # Remove leading generation numbers (1-9) that got stuck in the name
+        name = NAME_LEADING_GEN_RE.sub('', name)
 
-    # Clean up
-    name = re.sub(r'\s+', ' ', name).strip()
+        # Also remove if it's just digits and spaces at the start
+        name = NAME_LEADING_DIGITS_RE.sub('', name)
 
-    # Run date removal again after cleanup (catches more cases)
-    name = re.sub(r'\s+[A-Za-z]{3}\s+\d+[A-Za-z]?[;:,]?\s*\d*\s*$', '', name)
+    return name
 
-    # Remove leading/trailing punctuation
-    name = re.sub(r'^[,\-\s]+|[,\-\s]+$', '', name)
 
-    # Remove leading generation numbers (1-9) that got stuck in the name
-    # Pattern: starts with single digit followed by space and uppercase letter
-    name = re.sub(r'^(\d)\s+(?=[A-Z])', '', name)
+def tokenize_line(line: str) -> Optional[LineTokens]:
+    """
+    Split a line into its tokens.
+    Returns None for blank lines, page numbers and index entries. Lines
+    without a generation marker come back with generation None and no
+    date or name tokens.
+    """
+    line = line.strip()
 
-    # Also remove if it's just digits and spaces at the start
-    name = re.sub(r'^[\d\s]+(?=[A-Za-z])', '', name)
+    if not line:
+        return None
 
-    return name
+    # Skip index pages and page numbers
+    if PAGE_NUMBER_RE.match(line):
+        return None
+    if 'INDEX OF DESCENDANT' in line.upper():
+        return None
+    if INDEX_ENTRY_RE.match(line):
+        return None
+
+    # NOTE: + or † indicates a spouse
+    # NOTE: * indicates a RE-LISTING of a person for additional marriages
+    #       (the person is NOT a spouse, they are being re-listed so their
+    #        next spouse can be shown). Treat * entries as regular persons.
+    is_spouse = False
+    is_relisting = False
+
+    if line.startswith(SPOUSE_PREFIXES):
+        is_spouse = True
+    elif line.startswith(RELISTING_PREFIXES):
+        is_relisting = True
+        line = RELISTING_MARKER_RE.sub('', line)
+
+    # Generation number - "5 Name", ".5 Name" or OCR noise like "....,5 Name"
+    generation = None
+    if has_digit(line):
+        gen_match = GENERATION_RE.match(line)
+        if gen_match:
+            generation = int(gen_match.group(1))
+            line = line[gen_match.end():]
+        else:
+            # Try to find generation number elsewhere in the line
+            gen_search = GENERATION_INLINE_RE.search(line)
+            if gen_search:
+                generation = int(gen_search.group(1))
+
+    # Spouse lines don't need a generation number
+    if is_spouse and generation is None:
+        generation = 0  # Will be handled specially
+
+    tokens = LineTokens(generation=generation, is_spouse=is_spouse,
+                        is_relisting=is_relisting, body=line)
+    if generation is None:
+        return tokens
+
+    (tokens.birth_year, tokens.birth_year_circa,
+     tokens.death_year, tokens.death_year_circa) = scan_years(line)
+    tokens.name = scan_name(line)
+    return tokens
+
+
+def extract_years(text: str) -> tuple:
+    """
+    Extract birth and death years from a text string.
+    Returns (birth_year, birth_circa, death_year, death_circa)
+    """
+    return scan_years(text)
+
+
+def clean_name(text: str) -> str:
+    """Extract and clean the person's name from text."""
+    return scan_name(text)
 
 
 def is_valid_name(name: str) -> bool:
@@ -194,310 +375,649 @@ def is_valid_name(name: str) -> bool:
         return False
 
     # Must contain at least one letter
-    if not re.search(r'[A-Za-z]', name):
+    if not HAS_LETTER_RE.search(name):
         return False
 
     # Should not be just numbers with spaces/punctuation
-    if re.match(r'^[\d\s\.\-\,\+]+$', name):
+    if ONLY_NUMERIC_RE.match(name):
         return False
 
     # Reject names that look like dates (e.g., "Jun 9", "Oct 19", "Qct 19")
-    if re.match(r'^[A-Za-z]{3,4}\s+\d+$', name):
+    if DATE_LIKE_RE.match(name):
         return False
 
     # Reject names that are mostly lowercase garbage (like "on 20", "tep' 159")
-    if re.match(r'^[a-z]+[\s\'\d]+$', name):
+    if LOWERCASE_GARBAGE_RE.match(name):
         return False
 
     # Reject names with numbers in the middle (like "Teacy 1 Sehe")
     # But allow suffixes like "Jr" "Sr" "II" "III" at end
-    name_without_suffix = re.sub(r',?\s*(Jr|Sr|II|III|IV|I)\s*$', '', name, flags=re.IGNORECASE)
-    if re.search(r'\s\d+\s', name_without_suffix):
+    if has_digit(name) and INNER_NUMBER_RE.search(NAME_SUFFIX_RE.sub('', name)):
         return False
 
     return True
 
 
+def entry_from_tokens(tokens: LineTokens, raw_line: str) -> Optional[ParsedEntry]:
+    """Build the ParsedEntry for a tokenized line, or None if it is not a person entry."""
+    if tokens.generation is None:
+        return None
+
+    # Validate name is not garbage OCR
+    if not is_valid_name(tokens.name):
+        return None
+
+    return ParsedEntry(
+        generation=tokens.generation,
+        is_spouse=tokens.is_spouse,
+        is_relisting=tokens.is_relisting,
+        name=tokens.name,
+        birth_year=tokens.birth_year,
+        birth_year_circa=tokens.birth_year_circa,
+        death_year=tokens.death_year,
+        death_year_circa=tokens.death_year_circa,
+        raw_line=raw_line
+    )
+
+
+def line_outcome(tokens: Optional[LineTokens], entry: Optional[ParsedEntry]) -> str:
+    """Which parse branch a line took, for profiling counters."""
+    if tokens is None:
+        return 'skipped'
+    if tokens.generation is None:
+        return 'no_generation'
+    if entry is None:
+        return 'invalid_name'
+    if entry.is_spouse:
+        return 'spouse'
+    return 'relisting' if entry.is_relisting else 'person'
+
+
 def parse_line(line: str) -> Optional[ParsedEntry]:
     """
     Parse a single line from the genealogy document.
     Returns None if the line doesn't contain a person entry.
     """
-    original_line = line
-    line = line.strip()
+    tokens = tokenize_line(line)
+    return entry_from_tokens(tokens, line) if tokens is not None else None
+
+
+# Lines that are just a generation number (with optional OCR noise prefix)
+JUST_GENERATION_RE = re.compile(r'^' + OCR_NOISE + r'(\d)\s*$')
+
+# Lines that are just dates (birth/death info)
+DATE_ONLY_RE = re.compile(
+    r'^' + OCR_NOISE +  # Optional OCR noise prefix
+    r'('
+    r'[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}'  # "Jan 30, 1940"
+    r'|'
+    r'\d{4}\s*[-–]\s*'  # "1940 -" (partial date range)
+    r'|'
+    r'[-–]\s*[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}'  # "- Mar 13, 1976"
+    r'|'
+    r'[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}\s*[-–]\s*[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}'  # Full range
+    r'|'
+    r'\d{4}'  # Just a year like "1952"
+    r')'
+    r'\s*$'
+)
+
+# Lines ending with partial date (month day,) needing year from next line
+PARTIAL_DATE_ENDING_RE = re.compile(r'[A-Za-z]{3}\s+\d{1,2},\s*$')
+YEAR_ONLY_RE = re.compile(r'^' + OCR_NOISE + r'(\d{4})\s*$')
+
+# Lines that are just month+day (no year): "Jul 2," or "Jul 2"
+MONTH_DAY_ONLY_RE = re.compile(r'^' + OCR_NOISE + r'[A-Za-z]{3}\s+\d{1,2},?\s*$')
+
+# Lines that look like date fragments: "1940 - Jan 1," or "1963" or "Jan 1, 1963"
+DATE_FRAGMENT_RE = re.compile(
+    r'^' + OCR_NOISE +  # Optional leading punctuation
+    r'('
+    r'\d{4}'  # Year
+    r'|'
+    r'\d{4}\s*[-–]'  # Year followed by dash (death range start)
+    r'|'
+    r'\d{4}\s*[-–]\s*[A-Za-z]{3}\s+\d{1,2},?'  # "1940 - Jan 1,"
+    r')'
+)
+
+
+def iter_joined_spans(lines: Iterable[str], hits: dict = None) -> Iterator[tuple]:
+    """
+    Join OCR lines that belong to one multi-line entry, lazily.
 
-    if not line:
-        return None
+    Handles cases like:
+    - Line 1: "6"              (just generation number)
+    - Line 2: "Franklin Delano Ducheneaux"  (name)
+    - Line 3: "Jan 30, 1940"   (birth date on separate line)
 
-    # Skip index pages and page numbers
-    if re.match(r'^\d+$', line):
-        return None
-    if 'INDEX OF DESCENDANT' in line.upper():
-        return None
-    if re.match(r'^[A-Za-z]+,\s*[A-Za-z]+\.+\s*\d+$', line):
-        return None
+    These should all be joined into one entry. At most two lines of
+    lookahead are buffered, plus the date lines being joined.
 
-    # Detect if this is a spouse entry
-    # NOTE: + or † indicates a spouse
-    # NOTE: * indicates a RE-LISTING of a person for additional marriages
-    #       (the person is NOT a spouse, they are being re-listed so their
-    #        next spouse can be shown). Treat * entries as regular persons.
-    is_spouse = False
-    is_relisting = False  # Person re-listed for additional marriages
+    Yields (joined_line, first_index, last_index) with the 0-based indices
+    of the input lines it was built from.
 
-    if line.startswith(('+', '†', '.+', '..+', '...+')):
-        is_spouse = True
-    elif line.startswith(('*', '.*', '..*', '...*')):
-        # This is a re-listing of a person, NOT a spouse entry
-        is_relisting = True
-        # Strip the * prefix for cleaner parsing
-        line = re.sub(r'^[.*]+\s*', '', line)
-
-    # Extract generation number - look for pattern like "5 Name" or ".5 Name"
-    # Also handle OCR noise like commas, colons, semicolons: "....,5 Name"
-    gen_match = re.match(r'^[•.*†+,;:\-/\s]*(\d)\s+', line)
-    if gen_match:
-        generation = int(gen_match.group(1))
-        line = line[gen_match.end():]
-    else:
-        # Try to find generation number elsewhere in the line
-        gen_search = re.search(r'(?:^|\s)(\d)\s+[A-Z]', line)
-        if gen_search:
-            generation = int(gen_search.group(1))
-        else:
-            # If no generation found, might be continuation or spouse
-            generation = None
+    If hits is given (a defaultdict(int)), the rule that produced each
+    yielded line is counted in it as "join.<rule>".
+    """
+    if hits is None:
+        hits = defaultdict(int)
+
+    source = iter(lines)
+    ahead = deque()
+    taken = 0  # Input lines consumed so far
+
+    def peek(n: int = 0) -> Optional[str]:
+        """The n-th upcoming line (rstripped), or None past the end."""
+        while len(ahead) <= n:
+            try:
+                ahead.append(next(source).rstrip())
+            except StopIteration:
+                return None
+        return ahead[n]
+
+    def take() -> str:
+        nonlocal taken
+        taken += 1
+        return ahead.popleft()
+
+    def join_following(combined: str, pattern) -> str:
+        """Append upcoming lines for as long as they match pattern."""
+        while peek() is not None and pattern.match(ahead[0]):
+            combined = combined + ' ' + take()
+        return combined
+
+    while peek() is not None:
+        first = taken
+        line = take()
 
-    # If this is a spouse line, we don't need a generation number
-    if is_spouse and generation is None:
-        generation = 0  # Will be handled specially
+        # Check if this line is just a generation number (with optional prefixes)
+        # Pattern: punctuation/dots followed by single digit, nothing else meaningful
+        if JUST_GENERATION_RE.match(line) and peek() is not None:
+            # This is just a generation number - join with next line,
+            # and with the following line(s) if they are just dates
+            hits['join.generation_only'] += 1
+            yield join_following(line + ' ' + take(), DATE_ONLY_RE), first, taken - 1
+            continue
 
-    if generation is None:
-        return None
+        # Check if current line ends with partial date like "May 20,"
+        # and next line(s) are date fragments (year, "1940 - Jan 1,", etc.)
+        if peek() is not None and PARTIAL_DATE_ENDING_RE.search(line):
+            combined = join_following(line, DATE_FRAGMENT_RE)
+            if combined is not line:  # We joined at least one line
+                hits['join.partial_date'] += 1
+                yield combined, first, taken - 1
+                continue
 
-    # Extract years
-    birth_year, birth_circa, death_year, death_circa = extract_years(line)
+        # Check if current line is a name and next line(s) are just dates
+        # (handles cases where gen+name are together but dates are separate)
+        next_line = peek()
+        if next_line is not None:
+            # Special case: next line is month+day only (like "Jul 2,")
+            # and following line is year only (like "1988")
+            if MONTH_DAY_ONLY_RE.match(next_line):
+                year_line = peek(1)
+                if year_line is not None and YEAR_ONLY_RE.match(year_line):
+                    # Join all three: name + month_day + year, then more date lines
+                    take()
+                    take()
+                    hits['join.month_day_year'] += 1
+                    combined = join_following(line + ' ' + next_line + ' ' + year_line, DATE_ONLY_RE)
+                    yield combined, first, taken - 1
+                    continue
 
-    # Extract name
-    name = clean_name(line)
+            if DATE_ONLY_RE.match(next_line):
+                # Join name line with consecutive date line(s)
+                take()
+                hits['join.date_lines'] += 1
+                yield join_following(line + ' ' + next_line, DATE_ONLY_RE), first, taken - 1
+                continue
 
-    # Validate name is not garbage OCR
-    if not is_valid_name(name):
-        return None
+        hits['join.none'] += 1
+        yield line, first, first
 
-    return ParsedEntry(
-        generation=generation,
-        is_spouse=is_spouse,
-        is_relisting=is_relisting,
-        name=name,
-        birth_year=birth_year,
-        birth_year_circa=birth_circa,
-        death_year=death_year,
-        death_year_circa=death_circa,
-        raw_line=original_line
-    )
+
+def iter_joined_lines(lines: Iterable[str], hits: dict = None) -> Iterator[str]:
+    """Joined entry lines from iter_joined_spans, without their line spans."""
+    for line, _, _ in iter_joined_spans(lines, hits):
+        yield line
 
 
 def preprocess_lines(lines: list) -> list:
-    """
-    Preprocess OCR lines to handle multi-line entries.
+    """Preprocess OCR lines to handle multi-line entries (see iter_joined_spans)."""
+    return list(iter_joined_lines(lines))
 
-    Handles cases like:
-    - Line 1: "6"              (just generation number)
-    - Line 2: "Franklin Delano Ducheneaux"  (name)
-    - Line 3: "Jan 30, 1940"   (birth date on separate line)
 
-    These should all be joined into one entry.
-    """
-    processed = []
-    i = 0
-
-    # Pattern for lines that are just dates (birth/death info)
-    date_only_pattern = re.compile(
-        r'^[•.*†+,;:\-/\s]*'  # Optional OCR noise prefix
-        r'('
-        r'[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}'  # "Jan 30, 1940"
-        r'|'
-        r'\d{4}\s*[-–]\s*'  # "1940 -" (partial date range)
-        r'|'
-        r'[-–]\s*[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}'  # "- Mar 13, 1976"
-        r'|'
-        r'[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}\s*[-–]\s*[A-Za-z]{3}\s+\d{1,2},?\s*\d{4}'  # Full range
-        r'|'
-        r'\d{4}'  # Just a year like "1952"
-        r')'
-        r'\s*$'
-    )
+# ---------------------------------------------------------------------------
+# Page layout
+#
+# The OCR line store (see line_store.py) has the indent of every line. The
+# generation number sits in a column that moves right by a fixed step per
+# generation, so once that step is fitted, indentation gives the generation
+# of every line whose number OCR misread.
+# ---------------------------------------------------------------------------
 
-    # Pattern for lines ending with partial date (month day,) needing year from next line
-    partial_date_ending = re.compile(r'[A-Za-z]{3}\s+\d{1,2},\s*$')
-    year_only_pattern = re.compile(r'^[•.*†+,;:\-/\s]*(\d{4})\s*$')
+# A generation number leading a line, for fitting the indent step
+LAYOUT_GENERATION_RE = re.compile(r'^[•.,;:\-/\s]*(\d)(?:\s|$)')
 
-    # Pattern for lines that are just month+day (no year): "Jul 2," or "Jul 2"
-    month_day_only_pattern = re.compile(
-        r'^[•.*†+,;:\-/\s]*'  # Optional OCR noise prefix
-        r'[A-Za-z]{3}\s+\d{1,2},?\s*$'  # "Jul 2," or "Jul 2"
-    )
+# Whatever OCR read in the generation column, after the dot leaders
+LAYOUT_MARKER_RE = re.compile(r'^[•.,;:\-/\s]*(\S)\s*')
 
-    # Pattern for lines that look like date fragments (year, month day, ranges)
-    # Matches: "1940 - Jan 1," or "1963" or "Jan 1, 1963" etc.
-    date_fragment_pattern = re.compile(
-        r'^[•.*†+,;:\-/\s]*'  # Optional leading punctuation
-        r'('
-        r'\d{4}'  # Year
-        r'|'
-        r'\d{4}\s*[-–]'  # Year followed by dash (death range start)
-        r'|'
-        r'\d{4}\s*[-–]\s*[A-Za-z]{3}\s+\d{1,2},?'  # "1940 - Jan 1,"
-        r')'
-    )
 
-    while i < len(lines):
-        line = lines[i].rstrip()
+class PageLayout(NamedTuple):
+    """
+    Per-line layout of a page from the line store: the OCR text of each
+    line (to check the page file still matches), its generation level from
+    indentation (0 where the indent is not a generation column) and its
+    OCR confidence.
+    """
+    texts: list
+    levels: list
+    confidence: list
+
+    def level(self, index: int, raw_line: str) -> int:
+        if index < len(self.texts) and self.texts[index] == raw_line.rstrip('\n'):
+            return self.levels[index]
+        return 0
+
+    def span_confidence(self, first: int, last: int, raw_lines: list) -> Optional[float]:
+        """Lowest confidence of lines first..last, or None if the page file no longer matches."""
+        if last >= len(self.texts):
+            return None
+        if any(self.texts[k] != raw_lines[k].rstrip('\n') for k in range(first, last + 1)):
+            return None
+        return min(self.confidence[first:last + 1])
+
+
+def layout_generation(text: str) -> int:
+    """The generation number a line starts with, 0 for none (or spouse/re-listing lines)."""
+    text = text.strip()
+    if text.startswith(SPOUSE_PREFIXES) or text.startswith(RELISTING_PREFIXES):
+        return 0
+    match = LAYOUT_GENERATION_RE.match(text)
+    return int(match.group(1)) if match else 0
+
+
+def load_layouts(path: str, start_page: int = 3, end_page: int = 251) -> tuple:
+    """
+    Read the line store and infer the indent level of every line, all pages
+    at once. Returns ({page_num: PageLayout}, fitted step in pixels).
+    """
+    import numpy as np
+    from line_store import LineStore, indent_levels
 
-        # Check if this line is just a generation number (with optional prefixes)
-        # Pattern: punctuation/dots followed by single digit, nothing else meaningful
-        just_gen = re.match(r'^[•.*†+,;:\-/\s]*(\d)\s*$', line)
-
-        if just_gen and i + 1 < len(lines):
-            # This is just a generation number - join with next line(s)
-            next_line = lines[i + 1].rstrip()
-            combined = line + ' ' + next_line
-            i += 2
-
-            # Check if the following line is just a date - join it too
-            while i < len(lines):
-                following = lines[i].rstrip()
-                if date_only_pattern.match(following):
-                    combined = combined + ' ' + following
-                    i += 1
-                else:
-                    break
+    store = LineStore.load(path)
+    texts = store.texts()
+    generation = np.fromiter((layout_generation(text) for text in texts), dtype=np.int8, count=len(texts))
+    levels, step = indent_levels(store, generation)
+    confidence = np.round(store['confidence'].astype(np.float64), 3)
 
-            processed.append(combined)
-        else:
-            # Check if current line ends with partial date like "May 20,"
-            # and next line(s) are date fragments (year, "1940 - Jan 1,", etc.)
-            if i + 1 < len(lines) and partial_date_ending.search(line):
-                combined = line
-                j = i + 1
-                # Keep joining while next lines look like date fragments
-                while j < len(lines):
-                    next_line = lines[j].rstrip()
-                    if date_fragment_pattern.match(next_line):
-                        combined = combined + ' ' + next_line
-                        j += 1
-                    else:
-                        break
-                if j > i + 1:  # We joined at least one line
-                    processed.append(combined)
-                    i = j
-                    continue
+    layouts = {}
+    for page_num, (start, end) in store.page_bounds().items():
+        if start_page <= page_num <= end_page:
+            layouts[page_num] = PageLayout(texts[start:end], levels[start:end].tolist(),
+                                           confidence[start:end].tolist())
+    return layouts, step
 
-            # Check if current line is a name and next line(s) are just dates
-            # (handles cases where gen+name are together but dates are separate)
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].rstrip()
-
-                # Special case: next line is month+day only (like "Jul 2,")
-                # and following line is year only (like "1988")
-                if month_day_only_pattern.match(next_line) and i + 2 < len(lines):
-                    year_line = lines[i + 2].rstrip()
-                    if year_only_pattern.match(year_line):
-                        # Join all three: name + month_day + year
-                        combined = line + ' ' + next_line + ' ' + year_line
-                        j = i + 3
-                        # Keep joining more date lines if present
-                        while j < len(lines):
-                            following = lines[j].rstrip()
-                            if date_only_pattern.match(following):
-                                combined = combined + ' ' + following
-                                j += 1
-                            else:
-                                break
-                        processed.append(combined)
-                        i = j
-                        continue
-
-                if date_only_pattern.match(next_line):
-                    # Join name line with date line(s)
-                    combined = line + ' ' + next_line
-                    j = i + 2
-                    # Keep joining consecutive date lines
-                    while j < len(lines):
-                        following = lines[j].rstrip()
-                        if date_only_pattern.match(following):
-                            combined = combined + ' ' + following
-                            j += 1
-                        else:
-                            break
-                    processed.append(combined)
-                    i = j
-                    continue
 
-            processed.append(line)
-            i += 1
+def apply_layout(tokens: LineTokens, line: str, level: int, hits: dict) -> LineTokens:
+    """
+    Reconcile a line's tokens with the generation its indentation shows.
+    A line with no generation number whose text starts in a generation
+    column is re-read from that column: as a spouse line if a "+" sits
+    there behind noise that hid it (",+Rose"), otherwise with the number in
+    place ("I Shane Thomas" for "7 Shane Thomas"). A generation number that
+    disagrees with the column is replaced. Spouse and re-listing lines are
+    left as they are.
+    """
+    if not level or tokens.is_spouse or tokens.is_relisting:
+        return tokens
+
+    if tokens.generation is None:
+        text = line.strip()
+        marker = LAYOUT_MARKER_RE.match(text)
+        if marker is None or marker.group(1) == '*':
+            return tokens
+        if marker.group(1) in '+†':
+            recovered = tokenize_line(text[marker.start(1):])
+            rule = 'layout.spouse_recovered'
+        else:
+            recovered = tokenize_line(f"{level} {text[marker.end():]}")
+            rule = 'layout.generation_recovered'
+        if (recovered is not None and recovered.generation is not None
+                and (recovered.is_spouse or recovered.generation == level)
+                and is_valid_name(recovered.name)):
+            hits[rule] += 1
+            return recovered
+    elif tokens.generation != level:
+        hits['layout.generation_corrected'] += 1
+        tokens.generation = level
+    return tokens
 
-    return processed
 
+@dataclass
+class PageResult:
+    """
+    Entries parsed from a single OCR page, before cross-page stitching.
 
-def parse_ocr_pages(ocr_dir: str, start_page: int = 3, end_page: int = 251) -> list:
+    Pages are parsed independently, so an entry's parent is only known here
+    if the parent appears earlier on the same page. Otherwise the parent
+    comes from the previous page's trailing generation stack, which is
+    resolved by stitch_pages.
+    """
+    page_num: int
+    entries: list
+    # Parent name found on this page, or None
+    local_parents: list
+    # For entries whose parent must come from earlier pages: the lowest
+    # generation seen on this page before the entry (carried stack levels at
+    # or above it were cleared). None when no carried parent is needed.
+    carry_floors: list
+    # Generation stack built from this page alone
+    stack: dict
+    # Lowest non-spouse generation on the page (carried levels >= it are cleared)
+    floor: int
+    # How often each line-joining rule and parse outcome fired on this page
+    rule_hits: dict = field(default_factory=dict)
+
+
+# Larger than any generation number (single digit)
+NO_FLOOR = 10
+
+
+def line_byte_offsets(lines: list) -> list:
+    """UTF-8 byte offset of the start of each line, plus the end of the last one."""
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + (len(line) if line.isascii() else len(line.encode('utf-8'))))
+    return offsets
+
+
+def entry_provenance(entry: ParsedEntry, page_num: int) -> Optional[dict]:
+    """Provenance of a parsed entry: page and line/byte span in the page file."""
+    if entry.line_start is None:
+        return None
+    provenance = {
+        'page': page_num,
+        'line_start': entry.line_start,
+        'line_end': entry.line_end,
+        'byte_offset': entry.byte_offset,
+        'byte_end': entry.byte_end,
+    }
+    if entry.confidence is not None:
+        provenance['confidence'] = entry.confidence
+    return provenance
+
+
+def parse_page(page_num: int, text: str, layout: PageLayout = None) -> PageResult:
     """
-    Parse all OCR pages and build a list of parsed entries with context.
+    Preprocess and parse one page of OCR text, tracking a page-local
+    generation stack. With a layout, generations are checked against
+    indentation (see apply_layout).
+    """
+    result = PageResult(page_num=page_num, entries=[], local_parents=[],
+                        carry_floors=[], stack={}, floor=NO_FLOOR)
+    stack = result.stack
+    hits = defaultdict(int)
+
+    raw_lines = io.StringIO(text).readlines()
+    offsets = line_byte_offsets(raw_lines)
+
+    for line, first, last in iter_joined_spans(raw_lines, hits):
+        tokens = tokenize_line(line)
+        if layout is not None and tokens is not None:
+            tokens = apply_layout(tokens, line, layout.level(first, raw_lines[first]), hits)
+        entry = entry_from_tokens(tokens, line) if tokens is not None else None
+        hits[f"line.{line_outcome(tokens, entry)}"] += 1
+
+        if entry is None:
+            continue
+
+        entry.line_start = first + 1
+        entry.line_end = last + 1
+        entry.byte_offset = offsets[first]
+        entry.byte_end = offsets[last + 1]
+        if layout is not None:
+            entry.confidence = layout.span_confidence(first, last, raw_lines)
+
+        # Determine parent context
+        # Spouses are linked to the preceding person, not to a parent
+        parent_name = None
+        carry_floor = None
+
+        if not entry.is_spouse and entry.generation > 1:
+            # Children attach to the parent at generation - 1
+            parent_gen = entry.generation - 1
+            if parent_gen in stack:
+                parent_name = stack[parent_gen]
+            else:
+                carry_floor = result.floor
+
+        # Update the generation stack
+        if not entry.is_spouse:
+            stack[entry.generation] = entry.name
+            # Clear any higher generations (they're no longer in context)
+            for g in list(stack.keys()):
+                if g > entry.generation:
+                    del stack[g]
+            result.floor = min(result.floor, entry.generation)
+
+        result.entries.append(entry)
+        result.local_parents.append(parent_name)
+        result.carry_floors.append(carry_floor)
+
+    result.rule_hits = dict(hits)
+    return result
 
-    Returns a list of (entry, parent_context) tuples.
+
+def stitch_pages(page_results: Iterable[PageResult]) -> Iterator[tuple]:
     """
-    entries = []
+    Resolve cross-page parent context, in page order.
 
-    # Stack to track the current person at each generation level
-    # gen_stack[generation] = most recent person at that generation
+    Yields (entry, parent_name, page_num) tuples, identical to parsing all
+    pages with one running generation stack. Only that stack is carried
+    between pages.
+    """
+    # Generation stack carried over from the previous pages
     gen_stack = {}
 
+    for page in page_results:
+        for entry, parent_name, carry_floor in zip(page.entries, page.local_parents, page.carry_floors):
+            if carry_floor is not None and entry.generation - 1 < carry_floor:
+                parent_name = gen_stack.get(entry.generation - 1)
+            yield entry, parent_name, page.page_num
+
+        # Carried levels below the page's lowest generation survive it
+        gen_stack = {g: name for g, name in gen_stack.items() if g < page.floor}
+        gen_stack.update(page.stack)
+
+
+def parser_version() -> str:
+    """
+    Hash identifying the parsing code. Any edit to this module (or a
+    different Python version) invalidates cached page results.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()[:16]
+
+
+PAGE_CACHE_SUBDIR = 'parser-pages'
+PARSER_VERSION_RE = re.compile(r'^[0-9a-f]{16}$')
+
+
+class PageCache:
+    """
+    On-disk cache of parse_page results.
+
+    Entries are keyed by the SHA-256 of the page text (and layout, if any)
+    and stored as pickled plain tuples in a directory per parser version,
+    so unchanged pages are loaded instead of reparsed and a parser change
+    starts a fresh cache.
+
+    Versions live under a parser-pages/ subdirectory of cache_dir that the
+    cache owns, so pointing --cache-dir at a shared directory never prunes
+    anything else in it.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.root = Path(cache_dir) / PAGE_CACHE_SUBDIR
+        self.dir = self.root / parser_version()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        # Results from older parser versions can never be hit again
+        for stale in self.root.iterdir():
+            if stale.is_dir() and stale != self.dir and PARSER_VERSION_RE.match(stale.name):
+                shutil.rmtree(stale, ignore_errors=True)
+
+    def _path(self, text: str, layout: PageLayout = None) -> Path:
+        digest = hashlib.sha256(text.encode('utf-8'))
+        if layout is not None:
+            digest.update(repr(tuple(layout)).encode('utf-8'))
+        return self.dir / f"{digest.hexdigest()}.pkl"
+
+    def get(self, page_num: int, text: str, layout: PageLayout = None) -> Optional[PageResult]:
+        """Return the cached result for this page text and layout, or None."""
+        path = self._path(text, layout)
+        try:
+            with open(path, 'rb') as f:
+                entries, local_parents, carry_floors, stack, floor, rule_hits = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return PageResult(
+            page_num=page_num,
+            entries=[ParsedEntry(*fields) for fields in entries],
+            local_parents=local_parents,
+            carry_floors=carry_floors,
+            stack=stack,
+            floor=floor,
+            rule_hits=rule_hits,
+        )
+
+    def put(self, text: str, result: PageResult, layout: PageLayout = None):
+        """Store a parsed page."""
+        record = (
+            [astuple(entry) for entry in result.entries],
+            result.local_parents,
+            result.carry_floors,
+            result.stack,
+            result.floor,
+            result.rule_hits,
+        )
+        # Write then rename so an interrupted run never leaves a truncated entry
+        path = self._path(text, layout)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+
+def iter_page_texts(ocr_dir: str, start_page: int = 3, end_page: int = 251) -> Iterator[tuple]:
+    """Yield (page_num, text) for each OCR page file that exists, in page order."""
     for page_num in range(start_page, end_page + 1):
         page_file = Path(ocr_dir) / f"page-{page_num:03d}.txt"
         if not page_file.exists():
             continue
 
         with open(page_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            yield page_num, f.read()
 
-        # Preprocess to handle multi-line entries
-        lines = preprocess_lines(lines)
 
-        for line_num, line in enumerate(lines):
-            # Handle multi-line entries by joining continuation lines
-            entry = parse_line(line)
-
-            if entry is None:
-                continue
+def iter_page_results(pages: Iterable[tuple], workers: int = 1,
+                      cache: PageCache = None, layouts: dict = None) -> Iterator[PageResult]:
+    """
+    Parse (page_num, text) pairs, yielding PageResults in page order.
 
-            # Determine parent context
-            parent_name = None
+    With workers > 1, pages are parsed in a process pool that is kept at
+    most a few pages per worker ahead of the consumer, so memory stays
+    bounded however many pages are streamed through. With a cache, only
+    pages whose text changed are parsed. layouts maps page numbers to
+    their PageLayout (see load_layouts).
+    """
+    layouts = layouts or {}
+
+    def store(text, layout, result):
+        if cache:
+            cache.put(text, result, layout)
+        return result
+
+    if workers <= 1:
+        for page_num, text in pages:
+            layout = layouts.get(page_num)
+            cached = cache.get(page_num, text, layout) if cache else None
+            yield cached if cached is not None else store(text, layout, parse_page(page_num, text, layout))
+        return
+
+    # Pages in flight, in order: (text, layout, cached PageResult or pending future)
+    window = deque()
+    max_ahead = workers * 4
+
+    def next_result():
+        text, layout, pending = window.popleft()
+        if isinstance(pending, PageResult):
+            return pending
+        return store(text, layout, pending.result())
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for page_num, text in pages:
+            layout = layouts.get(page_num)
+            cached = cache.get(page_num, text, layout) if cache else None
+            window.append((text, layout, cached if cached is not None
+                           else executor.submit(parse_page, page_num, text, layout)))
+            if len(window) > max_ahead:
+                yield next_result()
+
+        while window:
+            yield next_result()
+
+
+def parse_ocr_pages(ocr_dir: str, start_page: int = 3, end_page: int = 251, workers: int = 1,
+                    cache: PageCache = None, layouts: dict = None) -> Iterator[tuple]:
+    """
+    Parse all OCR pages, yielding parsed entries with context.
 
-            if entry.is_spouse:
-                # Spouses attach to the most recent non-spouse entry
-                if entries and not entries[-1][0].is_spouse:
-                    parent_name = None  # Will be linked as spouse, not child
-                    spouse_of = entries[-1][0].name
-                else:
-                    spouse_of = None
-            elif entry.generation > 1:
-                # Children attach to the parent at generation - 1
-                parent_gen = entry.generation - 1
-                if parent_gen in gen_stack:
-                    parent_name = gen_stack[parent_gen]
+    Pages are read, parsed (in a process pool when workers > 1) and
+    stitched together in page order as they stream through, so the result
+    does not depend on the number of workers and only a window of pages is
+    held in memory at once.
 
-            # Update the generation stack
-            if not entry.is_spouse:
-                gen_stack[entry.generation] = entry.name
-                # Clear any higher generations (they're no longer in context)
-                for g in list(gen_stack.keys()):
-                    if g > entry.generation:
-                        del gen_stack[g]
+    Yields (entry, parent_name, page_num) tuples.
+    """
+    pages = iter_page_texts(ocr_dir, start_page, end_page)
+    return stitch_pages(iter_page_results(pages, workers, cache, layouts))
 
-            entries.append((entry, parent_name, page_num))
 
-    return entries
+def correct_names(entries: Iterable[tuple], lexicon: NameLexicon, audit: list) -> Iterator[tuple]:
+    """
+    Pass (entry, parent_name, page_num) tuples through, correcting OCR
+    letter confusions in entry and parent names against the lexicon.
+    Parent names are earlier entry names, so both get the same correction.
+    Each corrected entry is appended to audit.
+    """
+    for entry, parent_name, page_num in entries:
+        name, corrections = lexicon.correct_name(entry.name)
+        if corrections:
+            audit.append({
+                'page': page_num,
+                'line': entry.line_start,
+                'original': entry.name,
+                'corrected': name,
+                'tokens': [correction._asdict() for correction in corrections],
+            })
+            entry.name = name
+        if parent_name:
+            parent_name = lexicon.correct_name(parent_name)[0]
+        yield entry, parent_name, page_num
 
 
 def build_persons_dict(entries: list) -> dict:
@@ -511,8 +1031,12 @@ def build_persons_dict(entries: list) -> dict:
     appearances are references under spouse's families (wrong parents).
     """
     persons = {}
+    # Secondary index: lowercase name -> person keys, kept in sync with persons
+    name_index = defaultdict(list)
     # Track which persons have already had their parents set
     parents_set = set()
+    # OCR confidence of the appearance each death year was read from
+    death_confidence = {}
 
     current_person = None
 
@@ -529,15 +1053,23 @@ def build_persons_dict(entries: list) -> dict:
                 birth_year_circa=entry.birth_year_circa,
                 death_year=entry.death_year,
                 death_year_circa=entry.death_year_circa,
-                generation=entry.generation if not entry.is_spouse else None
+                generation=entry.generation if not entry.is_spouse else None,
+                provenance=entry_provenance(entry, page_num)
             )
+            name_index[key[0]].append(key)
+            death_confidence[key] = entry.confidence
 
         person = persons[key]
 
-        # Update with any new information
-        if entry.death_year and not person.death_year:
+        # Update with any new information. When appearances disagree on the
+        # death year, the one OCR read with more confidence wins
+        if entry.death_year and (not person.death_year or (
+                entry.death_year != person.death_year
+                and entry.confidence is not None and death_confidence[key] is not None
+                and entry.confidence > death_confidence[key])):
             person.death_year = entry.death_year
             person.death_year_circa = entry.death_year_circa
+            death_confidence[key] = entry.confidence
 
         # Only set generation on first appearance - don't update from subsequent listings
         # A person may appear multiple times (under their parents, under their spouse's family, etc.)
@@ -551,10 +1083,13 @@ def build_persons_dict(entries: list) -> dict:
             current_person_key = (current_person.name.lower(), current_person.birth_year)
             if current_person_key in persons:
                 curr = persons[current_person_key]
+                source = entry_provenance(entry, page_num)
                 if entry.name not in curr.spouses:
                     curr.spouses.append(entry.name)
+                    curr.spouse_sources.setdefault(entry.name, source)
                 if curr.name not in person.spouses:
                     person.spouses.append(curr.name)
+                    person.spouse_sources.setdefault(curr.name, source)
         else:
             # This is a regular person entry
             current_person = person
@@ -568,7 +1103,7 @@ def build_persons_dict(entries: list) -> dict:
                 # Find the parent in our persons dict
                 # Handle multiple people with same name by preferring plausible parent age
                 parent_name_lower = parent_name.lower()
-                candidates = [(k, p) for k, p in persons.items() if k[0] == parent_name_lower]
+                candidates = [(k, persons[k]) for k in name_index.get(parent_name_lower, ())]
 
                 parent_key = None
                 parent = None
@@ -609,6 +1144,7 @@ def build_persons_dict(entries: list) -> dict:
                             parent.children.append(entry.name)
                         if parent.name not in person.parents:
                             person.parents.append(parent.name)
+                            person.parent_sources.setdefault(parent.name, entry_provenance(entry, page_num))
             # NOTE: If key is already in parents_set, we do NOT add any relationships
             # This prevents subsequent appearances from creating wrong parent-child links
 
@@ -643,15 +1179,37 @@ def infer_gender(name: str, spouses: list, children: list) -> Optional[str]:
     return None
 
 
+# Relatives' names this similar count as the same relative (OCR variants)
+CONTEXT_NAME_THRESHOLD = 0.92
+
+
+def best_context_match(person: Person, candidates: list) -> Person:
+    """The candidate sharing the most relatives with person; the first one on ties."""
+    if len(candidates) == 1:
+        return candidates[0]
+    context = person_context(person.parents, person.spouses, person.children)
+    best, best_similarity = candidates[0], 0.0
+    for candidate in candidates:
+        similarity = context_similarity(
+            context, person_context(candidate.parents, candidate.spouses, candidate.children),
+            CONTEXT_NAME_THRESHOLD
+        )
+        if similarity and similarity > best_similarity:
+            best, best_similarity = candidate, similarity
+    return best
+
+
 def merge_duplicates(persons: dict) -> dict:
     """
     Merge duplicate person entries.
 
     ONLY merge when the same person appears with (name, birth_year) and (name, None).
     Do NOT merge entries that both have birth years - they're different people!
-    """
-    from collections import defaultdict
 
+    When several entries with birth years share the name, a no-birth entry is
+    merged into the one whose relatives overlap most with its own (see
+    similarity.context_similarity), falling back to the first.
+    """
     # Group by normalized name
     by_name = defaultdict(list)
     for key, person in persons.items():
@@ -676,9 +1234,9 @@ def merge_duplicates(persons: dict) -> dict:
             # Only merge entries without birth year into ONE entry with birth year
             if without_birth:
                 if with_birth:
-                    # Merge the no-birth entries into the FIRST with-birth entry
-                    base_key, base = with_birth[0]
                     for key, other in without_birth:
+                        # Merge into the namesake with the most shared relatives, else the FIRST
+                        base = best_context_match(other, [person for _, person in with_birth])
                         # Merge data from no-birth entry
                         if not base.death_year and other.death_year:
                             base.death_year = other.death_year
@@ -687,9 +1245,11 @@ def merge_duplicates(persons: dict) -> dict:
                             base.generation = other.generation
                         if not base.parents and other.parents:
                             base.parents = other.parents
+                            base.parent_sources = other.parent_sources
                         for spouse in other.spouses:
                             if spouse not in base.spouses:
                                 base.spouses.append(spouse)
+                                base.spouse_sources.setdefault(spouse, other.spouse_sources.get(spouse))
                         for child in other.children:
                             if child not in base.children:
                                 base.children.append(child)
@@ -700,19 +1260,29 @@ def merge_duplicates(persons: dict) -> dict:
     return merged
 
 
-def find_person_by_name(persons: dict, name: str, child_birth_year: int = None) -> Optional[Person]:
+def build_name_index(persons: dict) -> dict:
+    """Map lowercase name to the keys of all persons with that name, in dict order."""
+    name_index = defaultdict(list)
+    for key in persons:
+        name_index[key[0]].append(key)
+    return name_index
+
+
+def find_person_by_name(persons: dict, name: str, child_birth_year: int = None,
+                        name_index: dict = None) -> Optional[Person]:
     """
     Find a person by name, handling cases where multiple people share the same name.
 
     If child_birth_year is provided, prefer a person who could plausibly be a parent
     (born at least 12 years before the child).
+
+    Pass a name_index from build_name_index when calling repeatedly; without
+    one, the index is built on every call.
     """
-    name_lower = name.lower()
-    candidates = []
+    if name_index is None:
+        name_index = build_name_index(persons)
 
-    for key, person in persons.items():
-        if key[0] == name_lower:
-            candidates.append(person)
+    candidates = [persons[key] for key in name_index.get(name.lower(), ())]
 
     if not candidates:
         return None
@@ -748,6 +1318,8 @@ def share_children_between_spouses(persons: dict) -> None:
     CRITICAL: A child can have at most 2 biological parents. This function
     will NOT add more than 2 parents to any person.
     """
+    name_index = build_name_index(persons)
+
     # For each person who has exactly 1 parent, try to add the second parent
     # (the spouse of the first parent)
     for key, person in persons.items():
@@ -756,7 +1328,7 @@ def share_children_between_spouses(persons: dict) -> None:
             continue
 
         parent_name = person.parents[0]
-        parent = find_person_by_name(persons, parent_name, person.birth_year)
+        parent = find_person_by_name(persons, parent_name, person.birth_year, name_index)
 
         if not parent:
             continue
@@ -766,7 +1338,7 @@ def share_children_between_spouses(persons: dict) -> None:
         for spouse_name in parent.spouses:
             if spouse_name not in person.parents:
                 # Find the spouse and validate age is plausible
-                spouse = find_person_by_name(persons, spouse_name, person.birth_year)
+                spouse = find_person_by_name(persons, spouse_name, person.birth_year, name_index)
 
                 # Skip if spouse would be impossibly young parent
                 if spouse and spouse.birth_year and person.birth_year:
@@ -775,6 +1347,8 @@ def share_children_between_spouses(persons: dict) -> None:
                         continue  # Skip this spouse, try next one
 
                 person.parents.append(spouse_name)
+                # Inferred from the line that placed the child under the first parent
+                person.parent_sources.setdefault(spouse_name, person.parent_sources.get(parent_name))
                 # Also add this person to spouse's children list
                 if spouse and person.name not in spouse.children:
                     spouse.children.append(person.name)
@@ -782,19 +1356,11 @@ def share_children_between_spouses(persons: dict) -> None:
                 break
 
 
-def export_to_json(persons: dict, output_file: str):
-    """Export persons dictionary to JSON for import into database."""
-    # First merge duplicates
-    persons = merge_duplicates(persons)
-
-    # Share children between spouses
-    share_children_between_spouses(persons)
-
-    output = []
-
+def iter_person_records(persons: dict) -> Iterator[dict]:
+    """Yield the exported JSON record of each person, inferring gender on the way."""
     for key, person in persons.items():
         person.gender = infer_gender(person.name, person.spouses, person.children)
-        output.append({
+        yield {
             'name': person.name,
             'birth_year': person.birth_year,
             'birth_year_circa': person.birth_year_circa,
@@ -804,13 +1370,40 @@ def export_to_json(persons: dict, output_file: str):
             'generation': person.generation,
             'parents': person.parents,
             'spouses': person.spouses,
-            'children': person.children
-        })
+            'children': person.children,
+            'provenance': person.provenance,
+            'parent_sources': person.parent_sources,
+            'spouse_sources': person.spouse_sources
+        }
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
 
-    return len(output)
+def export_to_json(persons: dict, output_file: str, profiler: Profiler = None):
+    """
+    Export persons dictionary to JSON for import into database.
+    Records are streamed to the file; a .ndjson/.jsonl name writes NDJSON.
+    """
+    profiler = profiler or Profiler('smart_parser', enabled=False)
+
+    # First merge duplicates
+    with profiler.stage('merge_duplicates') as stage:
+        persons = merge_duplicates(persons)
+        stage.items = len(persons)
+
+    # Share children between spouses
+    with profiler.stage('share_children') as stage:
+        share_children_between_spouses(persons)
+        stage.items = len(persons)
+
+    with profiler.stage('write_output') as stage:
+        stage.items = write_records(iter_person_records(persons), output_file)
+    return stage.items
+
+
+def count_rule_hits(page_results: Iterable[PageResult], profiler: Profiler) -> Iterator[PageResult]:
+    """Pass pages through, adding their rule hit counts to the profiler."""
+    for page in page_results:
+        profiler.add_counts('parser_rules', page.rule_hits)
+        yield page
 
 
 def main():
@@ -820,31 +1413,77 @@ def main():
     parser.add_argument('--ocr-dir', default='/Users/guthdx/terminal_projects/dx_clan/ocr_output',
                         help='Directory containing OCR page files')
     parser.add_argument('--output', default='/Users/guthdx/terminal_projects/dx_clan/backend/data/parsed_genealogy.json',
-                        help='Output JSON file')
+                        help='Output JSON file (.ndjson or .jsonl writes one record per line)')
     parser.add_argument('--start-page', type=int, default=3,
                         help='First page to parse (skip index)')
     parser.add_argument('--end-page', type=int, default=251,
                         help='Last page to parse')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Verbose output')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Parse pages in parallel with this many processes (0 = all cores)')
+    parser.add_argument('--cache-dir',
+                        help='Directory for cached page results (default: .page_cache next to --output)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse every page, ignoring and not updating the cache')
+    parser.add_argument('--lexicon',
+                        help='Name lexicon (from name_lexicon.py) used to correct OCR letter confusions in names')
+    parser.add_argument('--corrections',
+                        help='Audit log of name corrections (default: name_corrections.json next to --output)')
+    parser.add_argument('--layout',
+                        help='OCR line geometry store (lines.npz from ocr_all_pages.py, needs numpy) '
+                             'used to read generations from indentation')
+    add_profile_argument(parser)
 
     args = parser.parse_args()
 
     print(f"Parsing OCR pages {args.start_page} to {args.end_page}...")
-    entries = parse_ocr_pages(args.ocr_dir, args.start_page, args.end_page)
-    print(f"Found {len(entries)} entries")
-
-    print("Building person records...")
-    persons = build_persons_dict(entries)
+    workers = args.workers or os.cpu_count()
+    cache = None
+    if not args.no_cache:
+        cache = PageCache(args.cache_dir or os.path.join(os.path.dirname(args.output), '.page_cache'))
+    profiler = Profiler('smart_parser', enabled=args.profile is not None)
+
+    layouts = None
+    if args.layout:
+        with profiler.stage('load_layout') as stage:
+            layouts, step = load_layouts(args.layout, args.start_page, args.end_page)
+            stage.items = len(layouts)
+        print(f"Loaded line layout for {len(layouts)} pages (generation step {step:.1f}px)")
+
+    # Pages stream through parsing and stitching straight into the person records
+    pages = profiler.iterate('read_pages', iter_page_texts(args.ocr_dir, args.start_page, args.end_page))
+    results = profiler.iterate('parse_pages', iter_page_results(pages, workers, cache, layouts))
+    entries = profiler.iterate('stitch_pages', stitch_pages(count_rule_hits(results, profiler)))
+    audit = []
+    if args.lexicon:
+        lexicon = NameLexicon.load(args.lexicon)
+        entries = profiler.iterate('correct_names', correct_names(entries, lexicon, audit))
+    with profiler.stage('build_persons') as stage:
+        persons = build_persons_dict(entries)
+        stage.items = len(persons)
+    print(f"Found {profiler.items('stitch_pages')} entries")
     print(f"Created {len(persons)} unique persons")
+    if layouts is not None:
+        rules = profiler.counters['parser_rules']
+        print(f"Generations from indentation: {rules['layout.generation_recovered']} recovered, "
+              f"{rules['layout.generation_corrected']} corrected, "
+              f"{rules['layout.spouse_recovered']} spouse lines recovered")
 
     # Ensure output directory exists
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
 
     print(f"Exporting to {args.output}...")
-    count = export_to_json(persons, args.output)
+    count = export_to_json(persons, args.output, profiler)
     print(f"Exported {count} persons")
 
+    if args.lexicon:
+        corrections_file = args.corrections or os.path.join(os.path.dirname(args.output), 'name_corrections.json')
+        write_records(audit, corrections_file)
+        tokens = sum(len(record['tokens']) for record in audit)
+        print(f"Corrected {tokens} name tokens in {len(audit)} entries (audit: {corrections_file})")
+        profiler.add_counts('name_corrections', {'entries': len(audit), 'tokens': tokens})
+
     # Print some statistics
     with_parents = sum(1 for p in persons.values() if p.parents)
     with_children = sum(1 for p in persons.values() if p.children)
@@ -857,6 +1496,13 @@ def main():
     print(f"  Persons with spouses:  {with_spouses}")
     print(f"  Persons with birth year: {with_birth}")
 
+    if cache:
+        print(f"\nPage cache: {cache.summary()}")
+        profiler.add_counts('page_cache', {'hits': cache.hits, 'misses': cache.misses})
+
+    if args.profile:
+        profiler.write(args.profile)
+
 
 if __name__ == '__main__':
     main()
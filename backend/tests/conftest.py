@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The parser and import tools are plain scripts, imported by module name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
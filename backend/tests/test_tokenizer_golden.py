@@ -0,0 +1,66 @@
+"""
+The precompiled tokenizer in smart_parser must give exactly the results of
+the regex-per-call implementation it replaced.
+
+data/tokenizer_golden.jsonl.gz holds one record per distinct line of
+ocr_output, raw and after multi-line joining:
+
+    [line, extract_years(line), clean_name(line), parse_line(line) fields or null]
+
+It was produced by the smart_parser.py of commit bdc647a (before the
+tokenizer rewrite) and must not be regenerated from the current code.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from smart_parser import clean_name, extract_years, parse_line, preprocess_lines
+
+DATA = Path(__file__).parent / 'data' / 'tokenizer_golden.jsonl.gz'
+OCR_OUTPUT = Path(__file__).resolve().parents[2] / 'ocr_output'
+
+
+@pytest.fixture(scope='module')
+def golden() -> list:
+    with gzip.open(DATA, 'rt', encoding='utf-8') as f:
+        return [json.loads(record) for record in f]
+
+
+def entry_fields(line: str):
+    entry = parse_line(line)
+    if entry is None:
+        return None
+    return [entry.generation, entry.is_spouse, entry.is_relisting, entry.name,
+            entry.birth_year, entry.birth_year_circa, entry.death_year, entry.death_year_circa]
+
+
+def test_extract_years_matches_golden(golden):
+    mismatches = [(line, expected, list(extract_years(line)))
+                  for line, expected, _, _ in golden if list(extract_years(line)) != expected]
+    assert not mismatches, f"{len(mismatches)} lines differ, first: {mismatches[:10]}"
+
+
+def test_clean_name_matches_golden(golden):
+    mismatches = [(line, expected, clean_name(line))
+                  for line, _, expected, _ in golden if clean_name(line) != expected]
+    assert not mismatches, f"{len(mismatches)} lines differ, first: {mismatches[:10]}"
+
+
+def test_parse_line_matches_golden(golden):
+    mismatches = [(line, expected, entry_fields(line))
+                  for line, _, _, expected in golden if entry_fields(line) != expected]
+    assert not mismatches, f"{len(mismatches)} lines differ, first: {mismatches[:10]}"
+
+
+@pytest.mark.skipif(not OCR_OUTPUT.is_dir(), reason='ocr_output not present')
+def test_golden_covers_ocr_output(golden):
+    """Every raw and joined line of the current ocr_output is in the golden corpus."""
+    covered = {record[0] for record in golden}
+    missing = set()
+    for page in sorted(OCR_OUTPUT.glob('page-*.txt')):
+        raw = page.read_text(encoding='utf-8').splitlines()
+        missing.update(line for line in raw + preprocess_lines(raw) if line not in covered)
+    assert not missing, f"{len(missing)} lines not in the golden corpus, first: {sorted(missing)[:10]}"
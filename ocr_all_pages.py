@@ -1,66 +1,109 @@
 #!/usr/bin/env python3
-"""OCR all pages using Apple Vision framework."""
+"""
+OCR all pages with a pluggable backend (see ocr_backends.py).
 
-import os
-import sys
-from pathlib import Path
-
-import objc
-from Foundation import NSURL
-from Quartz import CIImage
-import Vision
-
-
-def ocr_image(image_path: str) -> str:
-    """Perform OCR on an image using Apple Vision."""
-    image_url = NSURL.fileURLWithPath_(image_path)
-    ci_image = CIImage.imageWithContentsOfURL_(image_url)
-
-    if ci_image is None:
-        return f"Error: Could not load image {image_path}"
-
-    handler = Vision.VNImageRequestHandler.alloc().initWithCIImage_options_(
-        ci_image, None
-    )
-
-    request = Vision.VNRecognizeTextRequest.alloc().init()
-    request.setRecognitionLevel_(Vision.VNRequestTextRecognitionLevelAccurate)
-    request.setUsesLanguageCorrection_(True)
+Apple Vision is the default on macOS and Tesseract elsewhere. Pages are
+recognized in parallel, and pages whose image and engine settings are
+unchanged since the last run come from the cache instead of the engine.
 
-    success, error = handler.performRequests_error_([request], None)
+With --preprocess, scans are deskewed, binarized and cropped first (see
+ocr_preprocess.py) and the engine reads the preprocessed images.
 
-    if not success:
-        return f"Error: {error}"
+Besides the page-NNN.txt files, the line geometry (box, confidence and
+indent of every line) is written to lines.npz in the output directory
+(backend/scripts/line_store.py, needs numpy), which the parser uses to
+read generations from indentation (smart_parser.py --layout).
+"""
 
-    results = request.results()
-    lines = []
-
-    for observation in results:
-        text = observation.topCandidates_(1)[0].string()
-        lines.append(text)
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
 
-    return "\n".join(lines)
+from ocr_backends import BACKENDS, OcrCache, TesseractBackend, default_backend_name, ocr_pages
 
 
 def main():
-    input_dir = Path("highres_pages")
-    output_dir = Path("ocr_output")
+    parser = argparse.ArgumentParser(description='OCR all page images')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=default_backend_name(),
+                        help='OCR engine (default: vision on macOS, tesseract elsewhere)')
+    parser.add_argument('--input-dir', default='highres_pages',
+                        help='Directory containing page-NNN.png images')
+    parser.add_argument('--output-dir', default='ocr_output',
+                        help='Directory for page-NNN.txt files')
+    parser.add_argument('--workers', '-j', type=int, default=0,
+                        help='Pages recognized in parallel (0 = all cores)')
+    parser.add_argument('--cache-dir', default='.ocr_cache',
+                        help='Directory for cached page results')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recognize every page, ignoring and not updating the cache')
+    parser.add_argument('--preprocess', action='store_true',
+                        help='Deskew, binarize and crop pages before OCR (needs numpy and Pillow)')
+    parser.add_argument('--lang', default='eng',
+                        help='Tesseract language')
+    parser.add_argument('--psm', type=int, default=6,
+                        help='Tesseract page segmentation mode')
+    parser.add_argument('--no-line-store', action='store_true',
+                        help='Do not write the line geometry store (lines.npz)')
+    args = parser.parse_args()
+
+    line_store = None
+    if not args.no_line_store:
+        sys.path.insert(0, str(Path(__file__).resolve().parent / 'backend' / 'scripts'))
+        try:
+            import line_store
+        except ImportError:
+            print("numpy is not installed; the line geometry store (lines.npz) will not be written")
+
+    if args.backend == 'tesseract':
+        backend = TesseractBackend(lang=args.lang, psm=args.psm)
+    else:
+        backend = BACKENDS[args.backend]()
+    cache = None if args.no_cache else OcrCache(args.cache_dir, backend)
+    workers = args.workers or os.cpu_count()
+
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
 
     pages = sorted(input_dir.glob("page-*.png"))
     total = len(pages)
 
-    print(f"Processing {total} pages with Apple Vision OCR...")
+    images = pages
+    if args.preprocess:
+        from ocr_preprocess import PreprocessSettings, preprocess_pages
 
-    for i, page in enumerate(pages, 1):
-        output_file = output_dir / f"{page.stem}.txt"
+        print(f"Preprocessing {total} pages ({workers} workers)...")
+        started = time.perf_counter()
+        images = preprocess_pages(pages, PreprocessSettings(), Path(args.cache_dir) / 'preprocessed', workers)
+        print(f"Preprocessing finished in {time.perf_counter() - started:.1f}s")
 
-        text = ocr_image(str(page))
-        output_file.write_text(text)
+    print(f"Processing {total} pages with {args.backend} OCR ({workers} workers)...")
+    started = time.perf_counter()
+
+    # The cache is keyed by the image the engine reads, so preprocessed and
+    # raw pages never share results
+    results = ocr_pages(images, backend, workers, cache)
+    page_lines = []
+    for i, (page, (_, lines, _)) in enumerate(zip(pages, results), 1):
+        # Line k of the text file is row k of the page in the line store
+        output_file = output_dir / f"{page.stem}.txt"
+        output_file.write_text("\n".join(line.text for line in lines))
+        page_lines.append((int(page.stem.rsplit('-', 1)[1]), lines))
 
         if i % 10 == 0 or i == total:
             print(f"  {i}/{total} complete")
 
+    print(f"OCR finished in {time.perf_counter() - started:.1f}s")
+    if cache:
+        print(f"OCR cache: {cache.summary()}")
+
+    if line_store:
+        store = line_store.LineStore.from_pages(page_lines)
+        store.save(output_dir / 'lines.npz')
+        print(f"Saved geometry of {len(store)} lines to {output_dir / 'lines.npz'}")
+
     print("Done! Combining into single file...")
 
     # Combine all text files
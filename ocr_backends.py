@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Pluggable OCR backends with a per-page result cache.
+
+Backends turn one page image into lines of text with their geometry
+(OcrLine: box, confidence and the x where the text starts after any dot
+leaders), which ocr_all_pages.py writes to the columnar line store the
+parser reads indentation from:
+
+- VisionBackend: Apple Vision (macOS, pyobjc) - the engine the current
+  ocr_output was produced with
+- TesseractBackend: the tesseract command-line tool, for Linux servers
+  (apt install tesseract-ocr)
+
+Each backend reports the settings that affect its output (engine version,
+language, page segmentation mode, ...). OcrCache stores results keyed by
+the SHA-256 of the image bytes plus those settings, so re-running OCR
+after fixing a few scans only recognizes the pages that changed.
+ocr_pages() recognizes the remaining pages in a process pool.
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+# Dot leaders and the OCR noise they turn into; the indent of a line is
+# where the first other character starts
+LEADER_CHARS = frozenset('.•·,:;\'` ')
+
+
+class OcrLine(NamedTuple):
+    """One recognized line, with its box in pixels (top-left origin)."""
+    text: str
+    x: float = 0.0
+    y: float = 0.0
+    w: float = 0.0
+    h: float = 0.0
+    confidence: float = 0.0
+    indent: float = 0.0
+
+
+class OcrError(Exception):
+    """The engine could not recognize a page."""
+
+
+def leader_length(text: str) -> int:
+    """Number of leading dot-leader characters."""
+    k = 0
+    while k < len(text) and text[k] in LEADER_CHARS:
+        k += 1
+    return k
+
+
+class OcrBackend:
+    """One OCR engine configuration."""
+
+    name = ''
+
+    def settings(self) -> dict:
+        """Everything that affects the recognized text, for the cache key."""
+        return {'backend': self.name}
+
+    def recognize(self, image_path: str) -> list:
+        """The page's OcrLines in reading order. Raises OcrError on failure."""
+        raise NotImplementedError
+
+    def ocr_image(self, image_path: str) -> str:
+        """The page as text, one line per OcrLine (or an "Error: ..." message)."""
+        try:
+            return "\n".join(line.text for line in self.recognize(image_path))
+        except OcrError as e:
+            return f"Error: {e}"
+
+
+class VisionBackend(OcrBackend):
+    """Apple Vision text recognition (accurate level, language correction on)."""
+
+    name = 'vision'
+
+    def settings(self) -> dict:
+        return {'backend': self.name, 'level': 'accurate', 'language_correction': True}
+
+    def recognize(self, image_path: str) -> list:
+        """Perform OCR on an image using Apple Vision."""
+        # pyobjc only exists on macOS, so import when a page is recognized
+        from Foundation import NSURL
+        from Quartz import CIImage
+        import Vision
+
+        image_url = NSURL.fileURLWithPath_(image_path)
+        ci_image = CIImage.imageWithContentsOfURL_(image_url)
+
+        if ci_image is None:
+            raise OcrError(f"Could not load image {image_path}")
+
+        handler = Vision.VNImageRequestHandler.alloc().initWithCIImage_options_(
+            ci_image, None
+        )
+
+        request = Vision.VNRecognizeTextRequest.alloc().init()
+        request.setRecognitionLevel_(Vision.VNRequestTextRecognitionLevelAccurate)
+        request.setUsesLanguageCorrection_(True)
+
+        success, error = handler.performRequests_error_([request], None)
+
+        if not success:
+            raise OcrError(str(error))
+
+        # Vision boxes are normalized with the origin at the bottom left
+        size = ci_image.extent().size
+        width, height = size.width, size.height
+        lines = []
+
+        for observation in request.results():
+            candidate = observation.topCandidates_(1)[0]
+            text = candidate.string()
+            box = observation.boundingBox()
+            x = box.origin.x * width
+            indent = x
+            start = leader_length(text)
+            if start < len(text):
+                char_box, _ = candidate.boundingBoxForRange_error_((start, 1), None)
+                if char_box is not None:
+                    indent = char_box.boundingBox().origin.x * width
+            lines.append(OcrLine(
+                text=text, x=x, y=(1 - box.origin.y - box.size.height) * height,
+                w=box.size.width * width, h=box.size.height * height,
+                confidence=float(candidate.confidence()), indent=indent,
+            ))
+
+        return lines
+
+
+class TesseractBackend(OcrBackend):
+    """
+    Tesseract via its command-line tool. psm 6 (one uniform block of text)
+    keeps the book's indented lines in reading order.
+    """
+
+    name = 'tesseract'
+
+    def __init__(self, lang: str = 'eng', psm: int = 6, oem: int = 1, command: str = 'tesseract'):
+        self.lang = lang
+        self.psm = psm
+        self.oem = oem
+        self.command = command
+        self._version = None
+
+    def version(self) -> str:
+        """First line of `tesseract --version`, so an engine upgrade invalidates the cache."""
+        if self._version is None:
+            result = subprocess.run([self.command, '--version'], capture_output=True, text=True, check=True)
+            self._version = (result.stdout or result.stderr).splitlines()[0].strip()
+        return self._version
+
+    def settings(self) -> dict:
+        return {'backend': self.name, 'version': self.version(),
+                'lang': self.lang, 'psm': self.psm, 'oem': self.oem}
+
+    def recognize(self, image_path: str) -> list:
+        # One page per process; tesseract's own threading would oversubscribe the pool
+        env = {**os.environ, 'OMP_THREAD_LIMIT': '1'}
+        result = subprocess.run(
+            [self.command, image_path, 'stdout', '-l', self.lang,
+             '--psm', str(self.psm), '--oem', str(self.oem), 'tsv'],
+            capture_output=True, text=True, env=env
+        )
+        if result.returncode != 0:
+            raise OcrError(result.stderr.strip())
+        return self.lines_from_tsv(result.stdout)
+
+    @staticmethod
+    def lines_from_tsv(tsv: str) -> list:
+        """
+        Group tesseract's TSV word rows into OcrLines. Confidence is the mean
+        word confidence; the indent is interpolated inside the first word,
+        since leaders are part of it ("....5") and the book is monospaced.
+        """
+        lines = {}
+        for row in tsv.splitlines()[1:]:
+            fields = row.split('\t')
+            if len(fields) < 12 or fields[0] != '5' or not fields[11].strip():
+                continue
+            key = (int(fields[2]), int(fields[3]), int(fields[4]))
+            left, top, width, height = (int(v) for v in fields[6:10])
+            lines.setdefault(key, []).append((left, top, width, height, float(fields[10]), fields[11]))
+
+        recognized = []
+        for words in lines.values():
+            left = min(w[0] for w in words)
+            top = min(w[1] for w in words)
+            right = max(w[0] + w[2] for w in words)
+            bottom = max(w[1] + w[3] for w in words)
+            text = ' '.join(w[5] for w in words)
+            indent = left
+            for word_left, _, word_width, _, _, word in words:
+                start = leader_length(word)
+                if start < len(word):
+                    indent = word_left + word_width * start / len(word)
+                    break
+            confidences = [w[4] for w in words if w[4] >= 0]
+            confidence = sum(confidences) / len(confidences) / 100 if confidences else 0.0
+            recognized.append(OcrLine(text, left, top, right - left, bottom - top, confidence, indent))
+        return recognized
+
+
+BACKENDS = {
+    'vision': VisionBackend,
+    'tesseract': TesseractBackend,
+}
+
+
+def default_backend_name() -> str:
+    """Vision on macOS (the reference OCR), Tesseract elsewhere."""
+    return 'vision' if os.uname().sysname == 'Darwin' else 'tesseract'
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """
+    On-disk cache of recognized page lines, one JSON file per (image,
+    settings). Unlike the parser's page cache nothing is pruned: switching
+    back to an earlier engine or setting hits its old results.
+    """
+
+    def __init__(self, cache_dir: str, backend: OcrBackend):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        settings = json.dumps(backend.settings(), sort_keys=True)
+        self.settings_hash = hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, image_hash: str) -> Path:
+        return self.dir / f"{image_hash}-{self.settings_hash}.json"
+
+    def get(self, image_hash: str) -> Optional[list]:
+        try:
+            with open(self._path(image_hash), 'r', encoding='utf-8') as f:
+                lines = [OcrLine(*fields) for fields in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return lines
+
+    def put(self, image_hash: str, lines: list):
+        # Write then rename so an interrupted run never leaves a truncated entry
+        path = self._path(image_hash)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps([list(line) for line in lines], ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+
+def _ocr_page(backend: OcrBackend, image_path: str) -> list:
+    try:
+        return backend.recognize(image_path)
+    except OcrError as e:
+        return [OcrLine(f"Error: {e}")]
+
+
+def is_error(lines: list) -> bool:
+    return len(lines) == 1 and lines[0].text.startswith('Error:')
+
+
+def ocr_pages(pages: Iterable[Path], backend: OcrBackend, workers: int = 1,
+              cache: OcrCache = None) -> Iterator[tuple]:
+    """
+    Recognize page images, yielding (page, lines, cached) in page order,
+    where lines are OcrLines (a single "Error: ..." line for a failed page).
+    Cached pages are yielded without running the engine; the rest are
+    recognized in a process pool when workers > 1.
+    """
+    pages = list(pages)
+    hashes = [file_sha256(page) for page in pages] if cache else [None] * len(pages)
+    cached = [cache.get(h) if cache else None for h in hashes]
+
+    def store(image_hash, lines):
+        # Failed pages are not cached, so the next run retries them
+        if cache and not is_error(lines):
+            cache.put(image_hash, lines)
+        return lines
+
+    if workers <= 1:
+        for page, image_hash, lines in zip(pages, hashes, cached):
+            if lines is not None:
+                yield page, lines, True
+            else:
+                yield page, store(image_hash, _ocr_page(backend, str(page))), False
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = [executor.submit(_ocr_page, backend, str(page)) if lines is None else None
+                   for page, lines in zip(pages, cached)]
+        for page, image_hash, lines, future in zip(pages, hashes, cached, pending):
+            if future is None:
+                yield page, lines, True
+            else:
+                yield page, store(image_hash, future.result()), False
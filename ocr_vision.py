@@ -1,49 +1,15 @@
 #!/usr/bin/env python3
 """OCR using Apple Vision framework."""
 
-import os
 import sys
 from pathlib import Path
 
-import objc
-from Foundation import NSURL
-from Quartz import CIImage
-import Vision
+from ocr_backends import VisionBackend
 
 
 def ocr_image(image_path: str) -> str:
     """Perform OCR on an image using Apple Vision."""
-    image_url = NSURL.fileURLWithPath_(image_path)
-    ci_image = CIImage.imageWithContentsOfURL_(image_url)
-
-    if ci_image is None:
-        return f"Error: Could not load image {image_path}"
-
-    # Create request handler
-    handler = Vision.VNImageRequestHandler.alloc().initWithCIImage_options_(
-        ci_image, None
-    )
-
-    # Create text recognition request
-    request = Vision.VNRecognizeTextRequest.alloc().init()
-    request.setRecognitionLevel_(Vision.VNRequestTextRecognitionLevelAccurate)
-    request.setUsesLanguageCorrection_(True)
-
-    # Perform request
-    success, error = handler.performRequests_error_([request], None)
-
-    if not success:
-        return f"Error: {error}"
-
-    # Extract text
-    results = request.results()
-    lines = []
-
-    for observation in results:
-        text = observation.topCandidates_(1)[0].string()
-        lines.append(text)
-
-    return "\n".join(lines)
+    return VisionBackend().ocr_image(image_path)
 
 
 def main():